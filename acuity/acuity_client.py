@@ -2,12 +2,58 @@
 Acuity Scheduling API client for fetching appointments and intake forms.
 """
 import requests
+import threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 from dateutil import parser as date_parser
 
 from config import config
 
+# orjson is optional: it parses the appointment lists straight from the response bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _parse_json(response: requests.Response):
+    """
+    Decode a JSON API response, using orjson when it is installed.
+    
+    Args:
+        response: Successful API response
+        
+    Returns:
+        Decoded JSON data
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            # Let requests raise its usual error for malformed bodies
+            pass
+    return response.json()
+
+
+# One pooled session for all Acuity calls, so connections (and their TLS
+# handshakes) are reused; transient failures are retried with backoff
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Get the shared Acuity HTTP session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            retries = Retry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+            session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retries))
+            _session = session
+        return _session
+
 
 class AcuityClient:
     """Client for interacting with Acuity Scheduling API."""
@@ -54,9 +100,9 @@ class AcuityClient:
             params["maxDate"] = max_date
         
         try:
-            response = requests.get(url, auth=self.auth, params=params)
+            response = _get_session().get(url, auth=self.auth, params=params)
             response.raise_for_status()
-            return response.json()
+            return _parse_json(response)
         except requests.exceptions.RequestException as e:
             print(f"[ERROR] Failed to fetch appointments: {e}")
             return []
@@ -74,9 +120,9 @@ class AcuityClient:
         url = f"{self.base_url}/appointments/{appointment_id}"
         
         try:
-            response = requests.get(url, auth=self.auth)
+            response = _get_session().get(url, auth=self.auth)
             response.raise_for_status()
-            return response.json()
+            return _parse_json(response)
         except requests.exceptions.RequestException as e:
             print(f"[ERROR] Failed to fetch appointment {appointment_id}: {e}")
             return None
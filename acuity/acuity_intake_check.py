@@ -12,10 +12,19 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from acuity.acuity_client import AcuityClient, IntakeFormService
 from config import config
 
+# orjson is optional: it formats the indented JSON dump much faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 ACUITY_USER_ID = config.ACUITY_USER_ID
 ACUITY_API_KEY = config.ACUITY_API_KEY
 BASE_URL = config.ACUITY_BASE_URL
 
+_BAR_EQ = "=" * 80
+_BAR_DASH = "-" * 80
+
 
 class AcuityIntakeChecker:
     """Wrapper for AcuityClient and IntakeFormService."""
@@ -70,19 +79,28 @@ class AcuityIntakeChecker:
             return None
         
         # Print as JSON
-        print("\n" + "="*80)
+        print("\n" + _BAR_EQ)
         print("JSON OUTPUT (One Record):")
-        print("="*80 + "\n")
+        print(_BAR_EQ + "\n")
         
+        # Build the whole string before writing, so an encoding error can't leave
+        # a partial dump on the console (orjson builds it in one C call)
+        text = None
+        if orjson is not None:
+            try:
+                text = orjson.dumps(record, option=orjson.OPT_INDENT_2).decode('utf-8')
+            except orjson.JSONEncodeError:
+                # e.g. non-str keys, which json converts to strings
+                pass
+        if text is None:
+            text = json.dumps(record, indent=2, ensure_ascii=False)
         try:
-            json_output = json.dumps(record, indent=2, ensure_ascii=False)
-            print(json_output)
+            sys.stdout.write(text + "\n")
         except UnicodeEncodeError:
             # Fallback to ASCII if there are encoding issues
-            json_output = json.dumps(record, indent=2, ensure_ascii=True)
-            print(json_output)
+            sys.stdout.write(json.dumps(record, indent=2, ensure_ascii=True) + "\n")
         
-        print("\n" + "="*80 + "\n")
+        print("\n" + _BAR_EQ + "\n")
         
         return record
     
@@ -92,40 +110,50 @@ class AcuityIntakeChecker:
             print("No intake forms found.")
             return
         
-        print(f"\n{'='*80}")
-        print(f"Found {len(appointments)} appointment(s) with intake forms:")
-        print(f"{'='*80}\n")
+        # Collect all lines and write them in one go instead of one print() per line
+        out = [
+            f"\n{_BAR_EQ}",
+            f"Found {len(appointments)} appointment(s) with intake forms:",
+            f"{_BAR_EQ}\n",
+        ]
         
         for i, apt in enumerate(appointments, 1):
             try:
-                print(f"Appointment #{i}:")
-                print(f"  ID: {apt.get('appointment_id')}")
-                print(f"  Client: {apt.get('client_name')}")
-                print(f"  Email: {apt.get('email')}")
-                print(f"  Phone: {apt.get('phone')}")
-                print(f"  Date/Time: {apt.get('datetime')}")
-                print(f"  Type: {apt.get('appointment_type')}")
-                print(f"\n  Intake Form Responses:")
+                out.append(f"Appointment #{i}:")
+                out.append(f"  ID: {apt.get('appointment_id')}")
+                out.append(f"  Client: {apt.get('client_name')}")
+                out.append(f"  Email: {apt.get('email')}")
+                out.append(f"  Phone: {apt.get('phone')}")
+                out.append(f"  Date/Time: {apt.get('datetime')}")
+                out.append(f"  Type: {apt.get('appointment_type')}")
+                out.append(f"\n  Intake Form Responses:")
                 
                 for form in apt.get('forms', []):
-                    print(f"    Form ID: {form.get('id')}")
-                    print(f"    Form Name: {form.get('name', 'N/A')}")
+                    out.append(f"    Form ID: {form.get('id')}")
+                    out.append(f"    Form Name: {form.get('name', 'N/A')}")
                     
                     for field in form.get('values', []):
                         field_name = field.get('name', 'Unknown Field')
                         field_value = field.get('value', 'N/A')
-                        # Handle Unicode encoding issues on Windows
-                        try:
-                            print(f"      - {field_name}: {field_value}")
-                        except UnicodeEncodeError:
-                            # Replace problematic characters
-                            safe_value = str(field_value).encode('ascii', 'replace').decode('ascii')
-                            print(f"      - {field_name}: {safe_value}")
+                        out.append(f"      - {field_name}: {field_value}")
                 
-                print(f"\n{'-'*80}\n")
+                out.append(f"\n{_BAR_DASH}\n")
             except Exception as e:
-                print(f"  Error printing appointment #{i}: {e}")
-                print(f"\n{'-'*80}\n")
+                out.append(f"  Error printing appointment #{i}: {e}")
+                out.append(f"\n{_BAR_DASH}\n")
+        
+        _write_lines(out)
+
+
+def _write_lines(lines: List[str]):
+    """Write lines to stdout in a single call."""
+    text = "\n".join(lines) + "\n"
+    try:
+        sys.stdout.write(text)
+    except UnicodeEncodeError:
+        # Handle Unicode encoding issues on Windows by replacing problematic characters
+        encoding = sys.stdout.encoding or 'ascii'
+        sys.stdout.write(text.encode(encoding, 'replace').decode(encoding))
 
 
 def main():
@@ -8,9 +8,13 @@ from typing import List, Dict, Optional, Set
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dateutil import parser as date_parser
+from requests.exceptions import HTTPError
 import pytz
 import csv
+import hashlib
+import json
 import os
 
 from config import config
@@ -18,6 +22,17 @@ from acuity.acuity_client import AcuityClient, IntakeFormService
 from airtable.airtable_client import AirtableClient, AirtableService, FieldMapper
 from csv_logger import CSVLogger
 
+_BAR_EQ = "=" * 80
+
+
+def _is_validation_error(error: Exception) -> bool:
+    """Check whether Airtable rejected a request as invalid (HTTP 422)."""
+    return (
+        isinstance(error, HTTPError)
+        and error.response is not None
+        and error.response.status_code == 422
+    )
+
 
 class AcuitySDK:
     """Acuity Scheduling operations."""
@@ -213,7 +228,8 @@ class AirtableSDK:
         self,
         acuity_record: Dict,
         verbose: bool = True,
-        timestamp_field: Optional[str] = None
+        timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
     ) -> Dict:
         """
         Inject an Acuity record into the current Airtable table.
@@ -222,11 +238,31 @@ class AirtableSDK:
             acuity_record: Acuity intake form record
             verbose: Print detailed output
             timestamp_field: Field name for current timestamp (optional)
+            timestamp_value: Date for the timestamp field (defaults to today)
             
         Returns:
             Created Airtable record
         """
-        return self._service.inject_acuity_record(acuity_record, verbose, timestamp_field)
+        return self._service.inject_acuity_record(acuity_record, verbose, timestamp_field, timestamp_value)
+    
+    def inject_records(
+        self,
+        acuity_records: List[Dict],
+        timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Inject several Acuity records into the current table with batched requests.
+        
+        Args:
+            acuity_records: Acuity intake form records
+            timestamp_field: Field name for current timestamp (optional)
+            timestamp_value: Date for the timestamp field (defaults to today)
+            
+        Returns:
+            Created Airtable records, in the same order as acuity_records
+        """
+        return self._service.inject_acuity_records(acuity_records, timestamp_field, timestamp_value)
     
     def get_matching_fields(self, acuity_record: Dict) -> Set[str]:
         """
@@ -240,6 +276,10 @@ class AirtableSDK:
         """
         return self._service.mapper.get_matching_fields(acuity_record)
     
+    def load_columns(self):
+        """Fetch the current table's columns now instead of on first use."""
+        self._service.load_fields()
+    
     @property
     def field_mapper(self) -> FieldMapper:
         """Get the field mapper instance."""
@@ -341,6 +381,7 @@ class CSVSDK:
         existing_records_signatures = set()
         existing_records_by_id = {}
         existing_headers = []
+        file_headers = []
         file_exists = os.path.exists(filepath)
         if file_exists:
             try:
@@ -348,6 +389,7 @@ class CSVSDK:
                     reader = csv.DictReader(f)
                     # Get existing headers (fieldnames might contain None values, so filter them)
                     if reader.fieldnames:
+                        file_headers = list(reader.fieldnames)
                         existing_headers = [h for h in reader.fieldnames if h and h != 'Export Timestamp']
                         # Add existing headers to all_fields to preserve them
                         all_fields.update(h for h in existing_headers if h)
@@ -374,9 +416,21 @@ class CSVSDK:
         
         # Create header - filter out any None values before sorting
         filtered_fields = [f for f in all_fields if f is not None and f != '']
-        headers = ['Export Timestamp'] + sorted(filtered_fields)
+        if file_headers:
+            # Keep the file's column order so appended rows line up with existing
+            # ones; new columns go at the end
+            known_fields = set(file_headers)
+            new_fields = sorted(f for f in filtered_fields if f not in known_fields)
+            if 'Export Timestamp' not in known_fields:
+                new_fields.insert(0, 'Export Timestamp')
+            headers = file_headers + new_fields
+        else:
+            new_fields = []
+            headers = ['Export Timestamp'] + sorted(filtered_fields)
         
         # Determine which records are new or changed
+        # (all rows from one export share the same timestamp)
+        export_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         records_to_add = []
         for form in forms:
             apt_id = form.get('appointment_id', '')
@@ -385,7 +439,7 @@ class CSVSDK:
             
             # Build the row first to check for duplicates
             row = {
-                'Export Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'Export Timestamp': export_timestamp,
                 'Appointment ID': apt_id,
                 'Client Name': form.get('client_name', ''),
                 'Email': form.get('email', ''),
@@ -432,92 +486,113 @@ class CSVSDK:
         if records_to_add:
             with open(filepath, 'a' if file_exists else 'w', newline='', encoding='utf-8') as f:
                 writer = csv.DictWriter(f, fieldnames=headers)
-                if not file_exists:
+                if not file_headers:
                     writer.writeheader()
-                
-                for row in records_to_add:
-                    writer.writerow(row)
-            
-            # Fix rescheduled field for all records in the file
-            self._fix_rescheduled_field_in_file(filepath)
+                writer.writerows(records_to_add)
             
-            # Deduplicate records in the file
-            self._dedupe_csv_file(filepath)
+            # Fix rescheduled fields, drop duplicates and (if columns were added)
+            # update the header row in one read/rewrite
+            self._reconcile_csv_file(filepath, headers if new_fields else None)
     
-    def _fix_rescheduled_field_in_file(self, filepath: str):
+    def _reconcile_csv_file(self, filepath: str, new_headers: Optional[List[str]] = None):
         """
-        Fix the Rescheduled field in a CSV file after writing new records.
-        Marks records as rescheduled if they have the same appointment_id but different datetime.
+        Fix the Rescheduled field and remove duplicates in a CSV file after writing
+        new records, reading and (if anything changed) rewriting the file once.
         
         Args:
             filepath: Path to CSV file
+            new_headers: Extended header list if rows with new columns were appended
+                         (the file's header row is replaced with it)
         """
         if not os.path.exists(filepath):
             return
         
+        tmp_path = filepath + '.tmp'
         try:
-            # Read all records
-            records = []
             with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
+                if new_headers:
+                    # Read against the extended headers; the stale header row is skipped
+                    reader = csv.DictReader(f, fieldnames=new_headers)
+                    next(reader, None)
+                else:
+                    reader = csv.DictReader(f)
                 headers = reader.fieldnames
-                
-                if 'Rescheduled' not in headers:
-                    return  # No Rescheduled column, skip
-                
                 records = list(reader)
             
             if not records:
                 return
             
-            # Group records by appointment_id
-            records_by_appointment = defaultdict(list)
-            for i, record in enumerate(records):
-                apt_id = record.get('Appointment ID', '')
-                if apt_id:
-                    records_by_appointment[apt_id].append((i, record))
+            updates_made = bool(new_headers)
+            if 'Rescheduled' in headers:
+                updates_made = self._fix_rescheduled_records(records) or updates_made
             
-            # Track if any updates were made
-            updates_made = False
+            records, duplicates_removed = self._dedupe_records(records)
             
-            # For each appointment_id with multiple records
-            for apt_id, record_list in records_by_appointment.items():
-                if len(record_list) <= 1:
-                    continue  # Only one record, can't be rescheduled
-                
-                # Get all unique datetimes for this appointment
-                datetimes = set()
-                for _, record in record_list:
-                    datetime_val = record.get('Appointment DateTime', '')
-                    if datetime_val:
-                        datetimes.add(datetime_val)
-                
-                # If there are multiple datetimes, mark all but the first as rescheduled
-                if len(datetimes) > 1:
-                    # Sort by Export Timestamp to find the first one
-                    sorted_records = sorted(record_list, key=lambda x: x[1].get('Export Timestamp', ''))
-                    
-                    # First record stays as "No" (or keep existing value if already "Yes")
-                    first_idx, first_record = sorted_records[0]
-                    first_datetime = first_record.get('Appointment DateTime', '')
-                    
-                    # Mark all others with different datetime as rescheduled
-                    for idx, record in sorted_records[1:]:
-                        record_datetime = record.get('Appointment DateTime', '')
-                        if record_datetime != first_datetime:
-                            if records[idx].get('Rescheduled', 'No') != 'Yes':
-                                records[idx]['Rescheduled'] = 'Yes'
-                                updates_made = True
-            
-            # Write updated records back if changes were made
-            if updates_made:
-                with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            # Only rewrite if something changed; write a temporary file first so a
+            # failure can't leave the CSV half-written
+            if updates_made or duplicates_removed > 0:
+                with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
                     writer = csv.DictWriter(f, fieldnames=headers)
                     writer.writeheader()
                     writer.writerows(records)
+                os.replace(tmp_path, filepath)
         except Exception as e:
             # Silently fail - don't break the export if fixing fails
             pass
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _fix_rescheduled_records(self, records: List[Dict]) -> bool:
+        """
+        Mark records as rescheduled if they have the same appointment_id but different datetime.
+        
+        Args:
+            records: CSV records, updated in place
+            
+        Returns:
+            True if any record was updated
+        """
+        # Group records by appointment_id
+        records_by_appointment = defaultdict(list)
+        for i, record in enumerate(records):
+            apt_id = record.get('Appointment ID', '')
+            if apt_id:
+                records_by_appointment[apt_id].append((i, record))
+        
+        # Track if any updates were made
+        updates_made = False
+        
+        # For each appointment_id with multiple records
+        for apt_id, record_list in records_by_appointment.items():
+            if len(record_list) <= 1:
+                continue  # Only one record, can't be rescheduled
+            
+            # Get all unique datetimes for this appointment
+            datetimes = set()
+            for _, record in record_list:
+                datetime_val = record.get('Appointment DateTime', '')
+                if datetime_val:
+                    datetimes.add(datetime_val)
+            
+            # If there are multiple datetimes, mark all but the first as rescheduled
+            if len(datetimes) > 1:
+                # Sort by Export Timestamp to find the first one
+                sorted_records = sorted(record_list, key=lambda x: x[1].get('Export Timestamp', ''))
+                
+                # First record stays as "No" (or keep existing value if already "Yes")
+                first_idx, first_record = sorted_records[0]
+                first_datetime = first_record.get('Appointment DateTime', '')
+                
+                # Mark all others with different datetime as rescheduled
+                for idx, record in sorted_records[1:]:
+                    record_datetime = record.get('Appointment DateTime', '')
+                    if record_datetime != first_datetime:
+                        if records[idx].get('Rescheduled', 'No') != 'Yes':
+                            records[idx]['Rescheduled'] = 'Yes'
+                            updates_made = True
+        
+        return updates_made
     
     def _dedupe_csv_file(self, filepath: str):
         """
@@ -532,23 +607,10 @@ class CSVSDK:
             return
         
         try:
-            # Read all records
-            records = []
-            seen_signatures = set()
-            duplicates_removed = 0
-            
             with open(filepath, 'r', newline='', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 headers = reader.fieldnames
-                
-                for row in reader:
-                    signature = self._create_record_signature(row)
-                    
-                    if signature in seen_signatures:
-                        duplicates_removed += 1
-                    else:
-                        seen_signatures.add(signature)
-                        records.append(row)
+                records, duplicates_removed = self._dedupe_records(reader)
             
             # Only rewrite if duplicates were found
             if duplicates_removed > 0:
@@ -560,6 +622,31 @@ class CSVSDK:
             # Silently fail - don't break the export if deduplication fails
             pass
     
+    def _dedupe_records(self, rows) -> tuple:
+        """
+        Drop duplicate records, keeping the first occurrence of each.
+        
+        Args:
+            rows: Iterable of CSV records
+            
+        Returns:
+            Tuple of (unique records, number of duplicates removed)
+        """
+        records = []
+        seen_signatures = set()
+        duplicates_removed = 0
+        
+        for row in rows:
+            signature = self._create_record_signature(row)
+            
+            if signature in seen_signatures:
+                duplicates_removed += 1
+            else:
+                seen_signatures.add(signature)
+                records.append(row)
+        
+        return records, duplicates_removed
+    
     def _create_record_signature(self, row: Dict) -> str:
         """
         Create a unique signature from all field values (excluding Export Timestamp).
@@ -676,6 +763,17 @@ class AcuityAirtableSDK:
             form_type_keywords=form_type_keywords,
             fallback_form_name=fallback_form_name
         )
+        
+        # (export key, output snapshot, csv_files) of the last CSV export
+        self._last_export = None
+    
+    def close(self):
+        """
+        Flush the CSV logger's pending rows and close its open files.
+        
+        The SDK stays usable afterwards; files are reopened on the next write.
+        """
+        self.csv.logger.close()
     
     def sync(
         self,
@@ -697,17 +795,22 @@ class AcuityAirtableSDK:
             Dictionary with forms_fetched, successful, failed, records, errors
         """
         if verbose:
-            print(f"\n{'='*80}")
+            print(f"\n{_BAR_EQ}")
             print(f"ACUITY TO AIRTABLE SYNC")
-            print(f"{'='*80}")
+            print(f"{_BAR_EQ}")
             print(f"Fetching forms from last {hours} hours...")
         
-        forms = self.acuity.get_intake_forms(hours, include_canceled)
+        # Forms and Airtable columns come from different services, so fetch
+        # the columns in the background while the forms are fetched
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            columns_future = executor.submit(self.airtable.load_columns)
+            forms = self.acuity.get_intake_forms(hours, include_canceled)
+            columns_future.result()
         
         if verbose:
             print(f"Found {len(forms)} form(s)")
             print(f"Target table: {self.airtable.table_name}")
-            print(f"{'='*80}\n")
+            print(f"{_BAR_EQ}\n")
         
         if not forms:
             return {
@@ -721,31 +824,40 @@ class AcuityAirtableSDK:
         successful = []
         failed = []
         
-        for i, form in enumerate(forms, 1):
-            try:
-                if verbose:
-                    print(f"[{i}/{len(forms)}] Processing: {form.get('client_name')}")
-                
-                record = self.airtable.inject_record(form, verbose=False, timestamp_field=timestamp_field)
-                successful.append(record)
-                
-                if verbose:
-                    print(f"  Success - Record ID: {record['id']}\n")
-                    
-            except Exception as e:
-                failed.append({'form': form, 'error': str(e)})
+        # Insert in batches of up to AIRTABLE_BATCH_SIZE records per request.
+        # Inserts are network-bound, so overlap them; the client's rate limiter
+        # keeps the combined request rate within Airtable's per-base limit
+        batch_size = config.AIRTABLE_BATCH_SIZE
+        batches = [forms[start:start + batch_size] for start in range(0, len(forms), batch_size)]
+        # Every record in this sync gets the same date in the timestamp field
+        sync_date = datetime.now().strftime("%Y-%m-%d")
+        with ThreadPoolExecutor(max_workers=config.AIRTABLE_MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(self._inject_batch, batch, timestamp_field, sync_date)
+                for batch in batches
+            ]
+            
+            results = (result for future in futures for result in future.result())
+            for i, (form, (record, error)) in enumerate(zip(forms, results), 1):
+                if error is None:
+                    successful.append(record)
+                    outcome = f"  Success - Record ID: {record['id']}"
+                else:
+                    failed.append({'form': form, 'error': str(error)})
+                    outcome = f"  Failed: {error}"
                 
+                # One write per record instead of one per line
                 if verbose:
-                    print(f"  Failed: {e}\n")
+                    print(f"[{i}/{len(forms)}] Processing: {form.get('client_name')}\n{outcome}\n")
         
         if verbose:
-            print(f"{'='*80}")
+            print(f"{_BAR_EQ}")
             print(f"SYNC COMPLETE")
-            print(f"{'='*80}")
+            print(f"{_BAR_EQ}")
             print(f"  Total forms: {len(forms)}")
             print(f"  Successful: {len(successful)}")
             print(f"  Failed: {len(failed)}")
-            print(f"{'='*80}\n")
+            print(f"{_BAR_EQ}\n")
         
         return {
             'forms_fetched': len(forms),
@@ -755,6 +867,46 @@ class AcuityAirtableSDK:
             'errors': failed
         }
     
+    def _inject_batch(
+        self,
+        forms: List[Dict],
+        timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
+    ) -> List[tuple]:
+        """
+        Inject a batch of forms with one create request.
+        
+        Airtable rejects a whole batch if any record in it is invalid (422), so
+        on a validation error the forms are retried one by one to pin the error
+        to the offending records. Other errors (timeouts, rate limits, server
+        errors) are reported for the whole batch instead: the batch may already
+        have been created, and retrying it would create duplicates.
+        
+        Args:
+            forms: Intake form records (at most AIRTABLE_BATCH_SIZE)
+            timestamp_field: Field name for current timestamp (optional)
+            timestamp_value: Date for the timestamp field (defaults to today)
+            
+        Returns:
+            (created record, None) or (None, exception) for each form, in order
+        """
+        try:
+            return [
+                (record, None)
+                for record in self.airtable.inject_records(forms, timestamp_field, timestamp_value)
+            ]
+        except Exception as e:
+            if len(forms) == 1 or not _is_validation_error(e):
+                return [(None, e)] * len(forms)
+        
+        results = []
+        for form in forms:
+            try:
+                results.append((self.airtable.inject_record(form, False, timestamp_field, timestamp_value), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+    
     def export_to_csv(
         self,
         hours: int = 24,
@@ -778,6 +930,14 @@ class AcuityAirtableSDK:
         """
         forms = self.acuity.get_intake_forms(hours, include_canceled)
         
+        # Nothing to do if the same forms were already exported with the same
+        # options and the output files haven't been touched since
+        export_key = self._export_key(forms, group_by_appointment_type, output_dir, detect_cancellations)
+        last_export = self._last_export
+        if (last_export and last_export[0] == export_key
+                and last_export[1] == self._snapshot_csv_dir(output_dir)):
+            return dict(last_export[2])
+        
         csv_files = self.csv.export_forms_grouped(
             forms,
             output_dir,
@@ -793,8 +953,44 @@ class AcuityAirtableSDK:
                 if os.path.exists(filepath):
                     self.csv._dedupe_csv_file(filepath)
         
+        self._last_export = (export_key, self._snapshot_csv_dir(output_dir), dict(csv_files))
         return csv_files
     
+    def _export_key(self, forms: List[Dict], *options) -> str:
+        """
+        Hash the fetched forms together with the export options.
+        
+        Args:
+            forms: Intake form records
+            *options: Export options that affect the output
+            
+        Returns:
+            Hex digest identifying this export
+        """
+        payload = json.dumps([forms, options], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _snapshot_csv_dir(self, output_dir: str) -> Optional[frozenset]:
+        """
+        Get the name, size and mtime of every CSV file in a directory.
+        
+        Args:
+            output_dir: Directory containing CSV files
+            
+        Returns:
+            Frozenset of (name, size, mtime_ns), or None if the directory can't be read
+        """
+        try:
+            with os.scandir(output_dir) as entries:
+                return frozenset(
+                    (e.name, st.st_size, st.st_mtime_ns)
+                    for e in entries
+                    if e.name.endswith('.csv') and e.is_file()
+                    for st in (e.stat(),)
+                )
+        except OSError:
+            return None
+    
     def _detect_cancellations_from_csv(
         self,
         current_forms: List[Dict],
@@ -821,15 +1017,14 @@ class AcuityAirtableSDK:
         # Current time
         now = datetime.now()
         
-        # Get all CSV files in the output directory
-        if not os.path.exists(output_dir):
+        # Get all CSV files in the output directory (scandir avoids a stat per entry)
+        try:
+            with os.scandir(output_dir) as entries:
+                csv_files = [e.path for e in entries if e.name.endswith('.csv') and e.is_file()]
+        except OSError:
             return
         
-        csv_files = [f for f in os.listdir(output_dir) if f.endswith('.csv')]
-        
-        for csv_filename in csv_files:
-            csv_filepath = os.path.join(output_dir, csv_filename)
-            
+        for csv_filepath in csv_files:
             try:
                 # Read existing records
                 records = []
@@ -891,7 +1086,7 @@ class AcuityAirtableSDK:
                         for cancelled_record in cancelled_records_to_add:
                             writer.writerow(cancelled_record)
                     
-                    print(f"[INFO] Detected {len(cancelled_records_to_add)} cancellation(s) in {csv_filename}")
+                    print(f"[INFO] Detected {len(cancelled_records_to_add)} cancellation(s) in {os.path.basename(csv_filepath)}")
                     
                     # Deduplicate after adding cancelled records
                     self.csv._dedupe_csv_file(csv_filepath)
@@ -2,14 +2,89 @@
 Airtable API client.
 """
 from pyairtable import Api
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, FrozenSet, Iterable, Optional, Set
 from datetime import datetime
+from itertools import chain
+import re
+import threading
+import time
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from config import config
 
+# One alternation over all indicators instead of a substring scan per indicator
+_MULTI_SELECT_RE = re.compile(
+    '|'.join(re.escape(indicator) for indicator in config.MULTI_SELECT_INDICATORS),
+    re.IGNORECASE
+)
+
+# Fields every Acuity record maps to, whatever its forms contain
+_BASE_ACUITY_FIELDS = frozenset({"Name", "What is your email?"})
+
+
+def _today_str() -> str:
+    """Today's date as written to Airtable timestamp fields."""
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class RateLimiter:
+    """Thread-safe token bucket that limits calls to a fixed rate."""
+    
+    def __init__(self, rate: float, burst: int = None):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            rate: Allowed calls per second
+            burst: Maximum calls allowed back-to-back (defaults to rate)
+        """
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a call is allowed."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# Clients with the same API key share one Api, and with it one pooled HTTP session
+_apis: Dict[str, Api] = {}
+_apis_lock = threading.Lock()
+
+
+def _get_api(api_key: str) -> Api:
+    """Get the shared pyairtable Api for an API key."""
+    with _apis_lock:
+        if api_key not in _apis:
+            _apis[api_key] = Api(api_key)
+        return _apis[api_key]
+
+
+# Airtable rate limits apply per base, so clients for the same base share a limiter
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _get_rate_limiter(base_id: str) -> RateLimiter:
+    """Get the shared rate limiter for an Airtable base."""
+    with _rate_limiters_lock:
+        if base_id not in _rate_limiters:
+            _rate_limiters[base_id] = RateLimiter(config.AIRTABLE_REQUESTS_PER_SECOND)
+        return _rate_limiters[base_id]
+
 
 class AirtableClient:
     """Client for interacting with Airtable API."""
@@ -27,8 +102,9 @@ class AirtableClient:
         self.base_id = base_id or config.AIRTABLE_BASE_ID
         self.table_name = table_name or config.AIRTABLE_TABLE_NAME
         
-        self.api = Api(self.api_key)
+        self.api = _get_api(self.api_key)
         self.table = self.api.table(self.base_id, self.table_name)
+        self.rate_limiter = _get_rate_limiter(self.base_id)
     
     def get_all_records(self, max_records: int = None) -> List[Dict]:
         """
@@ -46,28 +122,35 @@ class AirtableClient:
             print(f"[ERROR] Failed to fetch records: {e}")
             return []
     
-    def get_all_field_names(self) -> List[str]:
+    def get_field_name_set(self) -> FrozenSet[str]:
         """
-        Get all unique field names from the table.
+        Get all unique field names from the table as an unordered set.
         
         Note: Fetches multiple records to ensure all fields are captured,
         since empty fields don't appear in individual records.
         
         Returns:
-            Sorted list of unique field names
+            Frozenset of unique field names
         """
         records = self.get_all_records()
         
         if not records:
             print("[WARNING] No records found in table")
-            return []
+            return frozenset()
         
-        # Collect all unique field names
-        all_fields = set()
-        for record in records:
-            all_fields.update(record['fields'].keys())
+        # Collect all unique field names in a single union pass
+        return frozenset().union(*(record['fields'].keys() for record in records))
+    
+    def get_all_field_names(self) -> List[str]:
+        """
+        Get all unique field names from the table.
         
-        return sorted(list(all_fields))
+        Use get_field_name_set() when order doesn't matter (e.g. field matching).
+        
+        Returns:
+            Sorted list of unique field names
+        """
+        return sorted(self.get_field_name_set())
     
     def create_record(self, fields: Dict) -> Dict:
         """
@@ -79,26 +162,49 @@ class AirtableClient:
         Returns:
             Created record dictionary
         """
+        self.rate_limiter.acquire()
         try:
             return self.table.create(fields)
         except Exception as e:
             print(f"[ERROR] Failed to create record: {e}")
             raise
+    
+    def create_records(self, fields_list: List[Dict]) -> List[Dict]:
+        """
+        Create several records, sending up to AIRTABLE_BATCH_SIZE per request.
+        
+        Args:
+            fields_list: List of field dictionaries, one per record
+            
+        Returns:
+            Created record dictionaries, in the same order as fields_list
+        """
+        batch_size = config.AIRTABLE_BATCH_SIZE
+        created = []
+        try:
+            for start in range(0, len(fields_list), batch_size):
+                self.rate_limiter.acquire()
+                created.extend(self.table.batch_create(fields_list[start:start + batch_size]))
+        except Exception as e:
+            print(f"[ERROR] Failed to create records: {e}")
+            raise
+        return created
 
 
 class FieldMapper:
     """Maps fields between Acuity and Airtable systems."""
     
-    def __init__(self, airtable_fields: List[str]):
+    def __init__(self, airtable_fields: Iterable[str]):
         """
         Initialize field mapper.
         
         Args:
-            airtable_fields: List of Airtable field names
+            airtable_fields: Airtable field names (any iterable, order not required)
         """
         self.airtable_fields = airtable_fields
-        self.airtable_fields_set = set(f.strip() for f in airtable_fields)
+        # Strip each column once; the keys double as the matching set
         self.name_mapping = {f.strip(): f for f in airtable_fields}
+        self.airtable_fields_set = set(self.name_mapping)
     
     def get_acuity_field_names(self, acuity_record: Dict) -> Set[str]:
         """
@@ -110,13 +216,13 @@ class FieldMapper:
         Returns:
             Set of field names (whitespace stripped)
         """
-        field_names = {"Name", "What is your email?"}
-        
-        for form in acuity_record.get('forms', []):
-            for field in form.get('values', []):
-                field_name = field.get('name', '').strip()
-                if field_name:
-                    field_names.add(field_name)
+        field_names = set(_BASE_ACUITY_FIELDS)
+        field_names.update(
+            field.get('name', '').strip()
+            for form in acuity_record.get('forms') or ()
+            for field in form.get('values') or ()
+        )
+        field_names.discard('')
         
         return field_names
     
@@ -131,13 +237,14 @@ class FieldMapper:
             Set of matching field names
         """
         acuity_fields = self.get_acuity_field_names(acuity_record)
-        return acuity_fields.intersection(self.airtable_fields_set)
+        return acuity_fields & self.airtable_fields_set
     
     def map_acuity_to_airtable(
         self,
         acuity_record: Dict,
         matching_fields: Optional[Set[str]] = None,
-        add_timestamp_field: Optional[str] = None
+        add_timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
     ) -> Dict:
         """
         Map Acuity record to Airtable field format.
@@ -146,6 +253,7 @@ class FieldMapper:
             acuity_record: Acuity intake form record
             matching_fields: Set of fields to include (None = include all)
             add_timestamp_field: Name of field to add current timestamp (None = don't add)
+            timestamp_value: Date to put in the timestamp field (defaults to today)
             
         Returns:
             Dictionary with Airtable field names and values
@@ -158,36 +266,37 @@ class FieldMapper:
         if acuity_record.get('email'):
             airtable_data['Email'] = acuity_record['email']
         
-        for form in acuity_record.get('forms', []):
-            for field in form.get('values', []):
-                field_name = field.get('name', '').strip()
-                field_value = field.get('value')
-                
-                if not field_name or field_value is None:
+        forms = acuity_record.get('forms') or ()
+        form_fields = chain.from_iterable(form.get('values') or () for form in forms)
+        for field in form_fields:
+            field_name = field.get('name', '').strip()
+            field_value = field.get('value')
+            
+            if not field_name or field_value is None:
+                continue
+            
+            if isinstance(field_value, str):
+                field_value = field_value.strip()
+                if not field_value:
                     continue
-                
-                if isinstance(field_value, str):
-                    field_value = field_value.strip()
-                    if not field_value:
-                        continue
-                
-                if self._is_multi_select_field(field_name):
-                    field_value = self._convert_to_array(field_value)
-                
-                airtable_data[field_name] = field_value
+            
+            if self._is_multi_select_field(field_name):
+                field_value = self._convert_to_array(field_value)
+            
+            airtable_data[field_name] = field_value
         
         if matching_fields is not None:
+            # Keys are already stripped above, so look them up directly
             filtered_data = {}
             for k, v in airtable_data.items():
-                k_stripped = k.strip()
-                if k_stripped in matching_fields:
-                    exact_name = self.name_mapping.get(k_stripped, k_stripped)
+                if k in matching_fields:
+                    exact_name = self.name_mapping.get(k, k)
                     filtered_data[exact_name] = v
             airtable_data = filtered_data
         
         if add_timestamp_field:
             timestamp_field_name = self.name_mapping.get(add_timestamp_field, add_timestamp_field)
-            airtable_data[timestamp_field_name] = datetime.now().strftime("%Y-%m-%d")
+            airtable_data[timestamp_field_name] = timestamp_value or _today_str()
         
         return airtable_data
     
@@ -196,18 +305,17 @@ class FieldMapper:
         Check if a field is a multi-select field in Airtable.
         
         Args:
-            field_name: Field name to check
+            field_name: Field name to check (already whitespace stripped)
             
         Returns:
             True if field is multi-select
         """
         # Check if field is in the explicit multi-select fields list
-        if field_name.strip() in config.MULTI_SELECT_FIELDS:
+        if field_name in config.MULTI_SELECT_FIELDS:
             return True
         
         # Check if field name contains multi-select indicators
-        return any(indicator in field_name.lower() 
-                  for indicator in config.MULTI_SELECT_INDICATORS)
+        return _MULTI_SELECT_RE.search(field_name) is not None
     
     def _convert_to_array(self, value) -> List:
         """
@@ -232,16 +340,52 @@ class AirtableService:
     """Service for Airtable operations."""
     
     def __init__(self, client: AirtableClient = None):
-        """Initialize Airtable service."""
+        """Initialize Airtable service (the table's fields are fetched on first use)."""
         self.client = client or AirtableClient()
-        self.field_names = self.client.get_all_field_names()
-        self.mapper = FieldMapper(self.field_names)
+        self._field_name_set = None
+        self._mapper = None
+        self._fields_lock = threading.Lock()
+    
+    @property
+    def field_names(self) -> List[str]:
+        """Sorted field names of the table."""
+        self.load_fields()
+        return sorted(self._field_name_set)
+    
+    @property
+    def mapper(self) -> FieldMapper:
+        """Field mapper for the table."""
+        self.load_fields()
+        return self._mapper
+    
+    def load_fields(self):
+        """
+        Fetch the table's field names and build the field mapper, once.
+        
+        Call this ahead of time to overlap the fetch with other work; otherwise
+        it happens on first use of field_names or mapper.
+        
+        Raises:
+            RuntimeError: If no fields could be fetched. Nothing is cached then,
+                          so the next use fetches again.
+        """
+        if self._mapper is None:
+            with self._fields_lock:
+                if self._mapper is None:
+                    # An empty set means the fetch failed (or the table has no
+                    # records); caching it would map every record to nothing
+                    field_name_set = self.client.get_field_name_set()
+                    if not field_name_set:
+                        raise RuntimeError(f"Could not load fields for Airtable table '{self.client.table_name}'")
+                    self._field_name_set = field_name_set
+                    self._mapper = FieldMapper(field_name_set)
     
     def inject_acuity_record(
         self,
         acuity_record: Dict,
         verbose: bool = True,
-        timestamp_field: Optional[str] = None
+        timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
     ) -> Dict:
         """
         Inject an Acuity record into Airtable.
@@ -250,17 +394,12 @@ class AirtableService:
             acuity_record: Acuity intake form record
             verbose: Whether to print detailed output
             timestamp_field: Name of field to add current timestamp (optional)
+            timestamp_value: Date for the timestamp field (defaults to today)
             
         Returns:
             Created Airtable record
         """
-        matching_fields = self.mapper.get_matching_fields(acuity_record)
-        
-        mapped_data = self.mapper.map_acuity_to_airtable(
-            acuity_record,
-            matching_fields=matching_fields,
-            add_timestamp_field=timestamp_field
-        )
+        mapped_data = self.build_airtable_data(acuity_record, timestamp_field, timestamp_value)
         
         if verbose:
             self._print_injection_info(acuity_record, mapped_data, timestamp_field)
@@ -272,18 +411,72 @@ class AirtableService:
         
         return created_record
     
-    def _print_injection_info(self, acuity_record: Dict, mapped_data: Dict, timestamp_field: Optional[str]):
-        """Print injection information."""
-        print(f"\nMapping Acuity record to Airtable...")
-        print(f"Acuity Appointment ID: {acuity_record.get('appointment_id')}")
-        print(f"Client: {acuity_record.get('client_name')}")
-        print(f"Fields to insert: {len(mapped_data)}")
+    def inject_acuity_records(
+        self,
+        acuity_records: List[Dict],
+        timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Inject several Acuity records into Airtable using batched create requests.
         
-        print("\nData to be inserted:")
+        Args:
+            acuity_records: Acuity intake form records
+            timestamp_field: Name of field to add current timestamp (optional)
+            timestamp_value: Date for the timestamp field (defaults to today,
+                             taken once for all records)
+            
+        Returns:
+            Created Airtable records, in the same order as acuity_records
+        """
+        if timestamp_field and not timestamp_value:
+            timestamp_value = _today_str()
+        fields_list = [
+            self.build_airtable_data(acuity_record, timestamp_field, timestamp_value)
+            for acuity_record in acuity_records
+        ]
+        return self.client.create_records(fields_list)
+    
+    def build_airtable_data(
+        self,
+        acuity_record: Dict,
+        timestamp_field: Optional[str] = None,
+        timestamp_value: Optional[str] = None
+    ) -> Dict:
+        """
+        Map an Acuity record to the Airtable fields that exist in the table.
+        
+        Args:
+            acuity_record: Acuity intake form record
+            timestamp_field: Name of field to add current timestamp (optional)
+            timestamp_value: Date for the timestamp field (defaults to today)
+            
+        Returns:
+            Dictionary with Airtable field names and values
+        """
+        matching_fields = self.mapper.get_matching_fields(acuity_record)
+        return self.mapper.map_acuity_to_airtable(
+            acuity_record,
+            matching_fields=matching_fields,
+            add_timestamp_field=timestamp_field,
+            timestamp_value=timestamp_value
+        )
+    
+    def _print_injection_info(self, acuity_record: Dict, mapped_data: Dict, timestamp_field: Optional[str]):
+        """Print injection information (collected and written in one call)."""
+        lines = [
+            f"\nMapping Acuity record to Airtable...",
+            f"Acuity Appointment ID: {acuity_record.get('appointment_id')}",
+            f"Client: {acuity_record.get('client_name')}",
+            f"Fields to insert: {len(mapped_data)}",
+            "\nData to be inserted:",
+        ]
         for field_name, field_value in mapped_data.items():
-            preview = str(field_value)[:50] + "..." if len(str(field_value)) > 50 else str(field_value)
+            value_str = str(field_value)
+            preview = value_str[:50] + "..." if len(value_str) > 50 else value_str
             marker = " [AUTO]" if timestamp_field and timestamp_field in field_name else ""
-            print(f"  - {field_name}: {preview}{marker}")
+            lines.append(f"  - {field_name}: {preview}{marker}")
+        lines.append("\nInserting into Airtable...")
         
-        print("\nInserting into Airtable...")
+        print("\n".join(lines))
 
@@ -10,9 +10,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from airtable.airtable_client import AirtableClient, AirtableService, FieldMapper
 
+_BAR_EQ = "=" * 80
+
 
 def get_all_column_names(api_key: str, base_id: str, table_name: str) -> List[str]:
-    """Fetch all column names from an Airtable table."""
+    """Fetch all column names from an Airtable table, sorted for display."""
     client = AirtableClient(api_key, base_id, table_name)
     return client.get_all_field_names()
 
@@ -20,7 +22,7 @@ def get_all_column_names(api_key: str, base_id: str, table_name: str) -> List[st
 def print_column_names(api_key: str, base_id: str, table_name: str):
     """Fetch and print all column names."""
     print(f"\nFetching column names from table: {table_name}")
-    print("="*80)
+    print(_BAR_EQ)
     
     column_names = get_all_column_names(api_key, base_id, table_name)
     
@@ -28,7 +30,7 @@ def print_column_names(api_key: str, base_id: str, table_name: str):
         print(f"\nFound {len(column_names)} columns:\n")
         for i, column in enumerate(column_names, 1):
             print(f"  {i}. {column}")
-        print("\n" + "="*80 + "\n")
+        print("\n" + _BAR_EQ + "\n")
     else:
         print("No columns found.\n")
     
@@ -1,16 +1,43 @@
+import logging
+import logging.handlers
+import queue
 import sys
 import traceback
 from datetime import datetime
 from acuity_airtable_sdk import AcuityAirtableSDK
 
+_BAR_EQ = "=" * 80
+
+
+def _start_logging() -> logging.handlers.QueueListener:
+    """
+    Route log records through a queue so the sync loop never blocks on console output.
+    
+    Records print as "[LEVEL] message", matching the rest of the script's output.
+    
+    Returns:
+        Running listener; stop() it before exiting to flush queued records
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    return listener
+
 
 def daily_student_sync(lookback_hours=24):
-    print("="*80)
+    print(_BAR_EQ)
     print("DAILY STUDENT PROFILE SYNC")
-    print("="*80)
+    print(_BAR_EQ)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"Lookback period: {lookback_hours} hours")
-    print("="*80 + "\n")
+    print(_BAR_EQ + "\n")
     
     form_type_keywords = [
         'help desk', 'helpdesk', 'q&a', 'q & a', 'session',
@@ -40,19 +67,22 @@ def daily_student_sync(lookback_hours=24):
         output_dir="forms_csv"
     )
     
+    # Settle the form CSVs now rather than at interpreter exit
+    sdk.close()
+    
     print(f"\nExported to {len(csv_files)} CSV file(s):")
     for form_type, filepath in csv_files.items():
         print(f"  - {form_type}: {filepath}")
     
-    print("\n" + "="*80)
+    print("\n" + _BAR_EQ)
     print("SYNC SUMMARY")
-    print("="*80)
+    print(_BAR_EQ)
     print(f"  Forms fetched: {results['forms_fetched']}")
     print(f"  Successfully synced: {results['successful']}")
     print(f"  Failed: {results['failed']}")
     print(f"  CSV files created: {len(csv_files)}")
     print(f"  Completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("="*80 + "\n")
+    print(_BAR_EQ + "\n")
     
     return results
 
@@ -73,6 +103,7 @@ if __name__ == "__main__":
             print("  python example_business_use_case.py 20")
             sys.exit(1)
     
+    log_listener = _start_logging()
     try:
         results = daily_student_sync(lookback_hours)
         
@@ -88,4 +119,6 @@ if __name__ == "__main__":
         print(f"ERROR: Sync failed - {e}")
         traceback.print_exc()
         sys.exit(2)
+    finally:
+        log_listener.stop()
 
@@ -47,18 +47,34 @@ class Config:
         'Rescheduled'
     ]
     
+    # Rows held in memory for a form CSV awaiting a header rewrite before it is
+    # compacted early (otherwise compaction runs when the CSVLogger is closed)
+    FORM_CSV_MAX_PENDING_ROWS = 1000
+    
+    # Write all form rows to a single daily forms_YYYYMMDD.csv (with a __form_type
+    # column) instead of one CSV per form type; see CSVLogger.split_aggregated()
+    AGGREGATE_FORMS = False
+    
     # Note: FORM_TYPE_KEYWORDS and form name extraction logic are now configurable
     # via CSVLogger initialization. See csv_logger.py for details.
     
-    MULTI_SELECT_INDICATORS = ['check all that apply', 'select all']
+    # Lowercase substrings that mark a field name as multi-select
+    MULTI_SELECT_INDICATORS = ('check all that apply', 'select all')
     
     # Specific fields that should be treated as multi-select
-    MULTI_SELECT_FIELDS = ['What is your current NYU status?']
+    MULTI_SELECT_FIELDS = frozenset({'What is your current NYU status?'})
     
     DEFAULT_LOOKBACK_HOURS = 24
     MAX_APPOINTMENTS = 100
     MAX_AIRTABLE_RECORDS_TO_SCAN = 100
     
+    # Airtable allows 5 requests per second per base
+    AIRTABLE_REQUESTS_PER_SECOND = 5
+    AIRTABLE_MAX_WORKERS = 5
+    
+    # Airtable accepts at most 10 records per create request
+    AIRTABLE_BATCH_SIZE = 10
+    
     @classmethod
     def validate(cls):
         """Validate required configuration values."""
@@ -2,21 +2,219 @@
 CSV logging utilities for Acuity appointments.
 Handles both the main log and form-specific CSV files.
 """
+import atexit
 import csv
+import io
+import logging
 import os
 import re
-from collections import defaultdict
-from datetime import datetime
+import shutil
+import string
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import itemgetter
 from dateutil import parser as date_parser
 import pytz
-from typing import Dict, Optional, List
+from typing import Dict, FrozenSet, Optional, List, Set, TextIO, Tuple
 from pathlib import Path
 
 from config import config
 
+# Warnings go through logging so they're formatted only if something emits them
+_log = logging.getLogger(__name__)
+
+# Timezones used when formatting appointment datetimes, built once at import
+_EST = pytz.timezone('US/Eastern')
+_CENTRAL = pytz.timezone('US/Central')
+_MOUNTAIN = pytz.timezone('US/Mountain')
+_PACIFIC = pytz.timezone('US/Pacific')
+_TZINFOS = {
+    'EST': _EST,
+    'EDT': _EST,
+    'CST': _CENTRAL,
+    'CDT': _CENTRAL,
+    'MST': _MOUNTAIN,
+    'MDT': _MOUNTAIN,
+    'PST': _PACIFIC,
+    'PDT': _PACIFIC,
+}
+
+# Acuity's canonical datetime format, e.g. 2026-03-09T16:00:00-0400. Python < 3.11
+# fromisoformat rejects the +HHMM offset, so it is matched directly instead.
+_ACUITY_DT_RE = re.compile(r'^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})([+-])(\d{2})(\d{2})$')
+
+
+def _parse_acuity_datetime(datetime_str: str) -> Optional[datetime]:
+    """Parse Acuity's canonical datetime format, or return None if it doesn't match."""
+    match = _ACUITY_DT_RE.match(datetime_str)
+    if match is None:
+        return None
+    
+    year, month, day, hour, minute, second, sign, offset_hours, offset_minutes = match.groups()
+    offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+    return datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second),
+        tzinfo=timezone(-offset if sign == '-' else offset)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _format_datetime_est(datetime_str: str) -> str:
+    """
+    Parse a datetime string and format it in US/Eastern time.
+    
+    Raises on unparseable input so failures aren't cached.
+    """
+    try:
+        dt = datetime.fromisoformat(datetime_str)
+    except ValueError:
+        dt = _parse_acuity_datetime(datetime_str)
+        if dt is None:
+            # Not ISO 8601 - fall back to the generic parser
+            dt = date_parser.parse(datetime_str, tzinfos=_TZINFOS)
+    
+    # If datetime is timezone-aware, convert to EST
+    if dt.tzinfo is not None:
+        dt_est = dt.astimezone(_EST)
+    else:
+        # If timezone-naive, assume UTC and convert to EST
+        dt_est = pytz.utc.localize(dt).astimezone(_EST)
+    
+    # Format: "March 9, 2026 4:00 PM EST" or "March 9, 2026 4:00 PM EDT"
+    timezone_abbr = dt_est.strftime('%Z')  # EST or EDT
+    return dt_est.strftime('%B %d, %Y %I:%M %p') + f' {timezone_abbr}'
+
+
+# Patterns used to turn appointment types into form CSV filenames
+_PRICE_PREFIX_RE = re.compile(r'^(free|paid|\$\d+)', re.IGNORECASE)
+_COLON_PREFIX_RE = re.compile(r'^[^:]+:\s*')
+_PRICE_BAR_RE = re.compile(r'^(FREE|PAID|\$\d+)\s*\|\s*', re.IGNORECASE)
+_PAREN_RE = re.compile(r'\s*\([^)]*\)')
+_NONALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+# ASCII characters other than [a-z0-9] map to '_', so cleaning ASCII names needs no regex
+_FILENAME_SAFE_CHARS = frozenset(string.ascii_lowercase + string.digits)
+_FILENAME_TRANS = str.maketrans({
+    chr(code): '_' for code in range(128) if chr(code) not in _FILENAME_SAFE_CHARS
+})
+
+# Characters that make csv.writer quote a field (QUOTE_MINIMAL with the default dialect)
+_UNSAFE_RE = re.compile(r'[,"\r\n]')
+
+# Column recording the appointment type in aggregated daily form CSVs
+_FORM_TYPE_COL = '__form_type'
+
+# Acuity record fields copied into the main log, read with one C-level itemgetter
+# when the record has all of them
+_LOG_RECORD_FIELDS = ('appointment_id', 'client_name', 'email', 'phone', 'appointment_type', 'dateCreated')
+_get_log_record_fields = itemgetter(*_LOG_RECORD_FIELDS)
+
+# Buffer size for CSV writes: rows are small, so a large buffer turns thousands of
+# write() calls per sync into a handful
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Building the appointment index reads form CSVs in parallel from this many files
+_INDEX_PARALLEL_MIN_FILES = 4
+_INDEX_MAX_WORKERS = 16
+
+# Form CSVs are compacted in parallel once this many of them need rewriting
+_COMPACT_PARALLEL_MIN_FILES = 2
+_COMPACT_MAX_WORKERS = 8
+
+# Form CSV column names looked up in the hot paths. Interned, like the headers
+# read from disk, so dict lookups and comparisons hit the identity fast path.
+_APT_ID = sys.intern('Appointment ID')
+_APT_DATETIME = sys.intern('Appointment DateTime')
+_CANCELED = sys.intern('Canceled')
+_RESCHEDULED = sys.intern('Rescheduled')
+_EXPORT_TS = sys.intern('Export Timestamp')
+_SYNC_TS = sys.intern('Sync Timestamp')
+
+# Timestamp columns are ignored when comparing records for duplicates
+_TIMESTAMP_FIELDS = frozenset({_EXPORT_TS, _SYNC_TS, sys.intern('Timestamp')})
+
+
+def _signature_from_items(items) -> FrozenSet[Tuple[str, str]]:
+    """
+    Build a record signature from (column, value) pairs.
+    
+    The signature is the set of non-empty (column, value) pairs, ignoring
+    timestamp columns, so no sorting or string building is needed and column
+    order doesn't matter. Empty values are skipped so a new row matches rows
+    read back from the file, where columns it doesn't have come back as empty.
+    """
+    fields = []
+    for key, value in items:
+        if key not in _TIMESTAMP_FIELDS and value is not None:
+            # Normalize values: convert to string and strip whitespace
+            normalized_value = str(value).strip()
+            if normalized_value:
+                fields.append((key, normalized_value))
+    
+    return frozenset(fields)
+
+
+def _serialize_rows(rows) -> bytes:
+    """Serialize rows exactly as csv.writer writes them to our files (UTF-8), in one buffer."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def _fast_row(values: List) -> str:
+    """
+    Serialize a main log row the way csv.writer does, without its per-field dispatch.
+    
+    Main log fields are mostly IDs, enums and timestamps, so fields are joined
+    as-is and only those containing a delimiter, quote or line break get quoted.
+    
+    Args:
+        values: Row values (None is written as an empty field)
+        
+    Returns:
+        CSV line including csv.writer's line terminator
+    """
+    fields = ['' if value is None else str(value) for value in values]
+    for i, field in enumerate(fields):
+        if _UNSAFE_RE.search(field):
+            fields[i] = '"' + field.replace('"', '""') + '"'
+    return ','.join(fields) + '\r\n'
+
+
+def _cell(row: List[str], index: Optional[int]) -> str:
+    """Get a csv.reader cell by column index, '' if the column or cell is missing."""
+    if index is None or index >= len(row):
+        return ''
+    return row[index]
+
+
+# Loggers with files still open, closed at interpreter exit so buffered and
+# pending rows reach disk. Weak, so a logger can still be garbage collected.
+_open_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers():
+    for logger in list(_open_loggers):
+        try:
+            logger.close()
+        except Exception as e:
+            _log.warning("Could not close CSV logger: %s", e)
+
 
 class CSVLogger:
-    """Handles all CSV logging operations for Acuity appointments."""
+    """
+    Handles all CSV logging operations for Acuity appointments.
+    
+    Form CSV writes are buffered, and rows that add columns to a file are held
+    in memory until the file is compacted. Call close() (or use the logger as a
+    context manager) when a sync is done; an interpreter-exit hook does the
+    same for loggers left open, but rows still held when the process is killed
+    or crashes are lost.
+    """
     
     def __init__(
         self,
@@ -34,33 +232,153 @@ class CSVLogger:
         """
         self.log_file = config.CSV_LOG_FILE
         self.forms_dir = config.FORMS_CSV_DIR
+        # Forms dir with a trailing separator, so paths are built by concatenation
+        self._forms_dir_prefix = os.path.join(self.forms_dir, '')
         
         # Form name extraction configuration
         self.form_type_keywords = form_type_keywords or []
         self.fallback_form_name = fallback_form_name or "unknown_form_type"
         
+        # Write all form rows to one daily file instead of one file per form type
+        self.aggregate_forms = config.AGGREGATE_FORMS
+        
+        # Keywords become a single alternation matched against lowercased text,
+        # same as a per-keyword substring scan
+        self._keyword_re = (
+            re.compile('|'.join(map(re.escape, self.form_type_keywords)))
+            if self.form_type_keywords else None
+        )
+        
+        # Appointment type -> CSV filename; the same few types recur across a sync
+        self._filename_cache: Dict[str, str] = {}
+        
+        # Appointment ID -> {(Appointment DateTime, Canceled)} across all form CSVs.
+        # Built lazily on first use and kept in sync as rows are written.
+        self._apt_index: Optional[Dict[str, Set[Tuple[str, str]]]] = None
+        
+        # Per form CSV: headers, row signatures and per-appointment reschedule info,
+        # loaded once per file so writes don't have to re-read the file
+        self._file_state: Dict[str, Dict] = {}
+        
+        # Append handles kept open across calls; flushed by close() or before the
+        # file is read back or rewritten
+        self._handles: Dict[str, TextIO] = {}
+        self._writers = {}
+        
+        # Shared timestamp for every row written between begin_sync() and end_sync()
+        self._sync_timestamp: Optional[str] = None
+        
         self._init_main_log()
         self._init_forms_directory()
+        
+        _open_loggers.add(self)
     
-    def _init_main_log(self):
-        """Initialize main CSV log file with headers if it doesn't exist."""
-        if not os.path.exists(self.log_file):
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def begin_sync(self):
+        """Start a sync: rows logged until end_sync() share one timestamp."""
+        self._sync_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def end_sync(self):
+        """End a sync started with begin_sync(); rows get their own timestamps again."""
+        self._sync_timestamp = None
+    
+    def _now_str(self) -> str:
+        """Get the current sync timestamp, or the current time outside a sync."""
+        return self._sync_timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    def close(self):
+        """
+        Apply deferred form CSV rewrites, then flush and close all open files.
+        
+        Cached file state and the appointment index are dropped too, so files
+        changed or removed after close() are read fresh on the next write.
+        """
+        self.compact_all()
+        for filepath in list(self._handles):
+            self._release_handle(filepath)
+        self._file_state.clear()
+        self._apt_index = None
+    
+    def _get_handle(self, filepath: str) -> TextIO:
+        """
+        Get a buffered append handle for a CSV file, opening it on first use.
+        
+        Args:
+            filepath: Path to CSV file
+            
+        Returns:
+            Open text file handle
+        """
+        handle = self._handles.get(filepath)
+        if handle is None:
+            handle = open(filepath, 'a', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
+            self._handles[filepath] = handle
+        return handle
+    
+    def _get_writer(self, filepath: str):
+        """
+        Get a cached csv.writer appending to a CSV file.
+        
+        Args:
+            filepath: Path to CSV file
+            
+        Returns:
+            csv.writer over the file's append handle
+        """
+        writer = self._writers.get(filepath)
+        if writer is None:
+            writer = csv.writer(self._get_handle(filepath))
+            self._writers[filepath] = writer
+        return writer
+    
+    def _release_handle(self, filepath: str):
+        """
+        Close the cached handle for a file (if any) so it can be read or rewritten.
+        
+        Args:
+            filepath: Path to CSV file
+        """
+        self._writers.pop(filepath, None)
+        handle = self._handles.pop(filepath, None)
+        if handle is not None:
             try:
-                with open(self.log_file, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(config.CSV_LOG_HEADERS)
-                print(f"[INFO] Created CSV log file: {self.log_file}")
+                handle.close()
             except Exception as e:
-                print(f"[WARNING] Could not create CSV log file: {e}")
+                _log.warning("Could not close CSV file %s: %s", filepath, e)
+    
+    def _flush_handles(self):
+        """Flush all open handles so other readers see every written row."""
+        for handle in self._handles.values():
+            handle.flush()
+    
+    def _init_main_log(self):
+        """Initialize main CSV log file with headers if it doesn't exist."""
+        # Exclusive create checks for the file and creates it in one call
+        try:
+            with open(self.log_file, 'x', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(config.CSV_LOG_HEADERS)
+            _log.info("Created CSV log file: %s", self.log_file)
+        except FileExistsError:
+            pass
+        except Exception as e:
+            _log.warning("Could not create CSV log file: %s", e)
     
     def _init_forms_directory(self):
         """Create directory for form-specific CSV files."""
-        if not os.path.exists(self.forms_dir):
-            try:
-                os.makedirs(self.forms_dir)
-                print(f"[INFO] Created forms CSV directory: {self.forms_dir}")
-            except Exception as e:
-                print(f"[WARNING] Could not create forms CSV directory: {e}")
+        try:
+            os.makedirs(self.forms_dir)
+            _log.info("Created forms CSV directory: %s", self.forms_dir)
+        except FileExistsError:
+            pass
+        except Exception as e:
+            _log.warning("Could not create forms CSV directory: %s", e)
     
     def log_appointment(
         self,
@@ -68,7 +386,8 @@ class CSVLogger:
         action: str,
         injected: bool = False,
         airtable_record_id: str = '',
-        notes: str = ''
+        notes: str = '',
+        formatted_datetime: Optional[str] = None
     ):
         """
         Log an appointment to the main CSV log.
@@ -79,58 +398,194 @@ class CSVLogger:
             injected: Whether record was injected to Airtable
             airtable_record_id: Airtable record ID if injected
             notes: Additional notes
+            formatted_datetime: Appointment datetime already formatted by
+                                _format_datetime_to_est (computed if None)
+        """
+        self.log_appointments_batch([{
+            'acuity_record': acuity_record,
+            'action': action,
+            'injected': injected,
+            'airtable_record_id': airtable_record_id,
+            'notes': notes,
+            'formatted_datetime': formatted_datetime
+        }])
+    
+    def log_appointments_batch(self, entries: List[Dict]):
+        """
+        Log several appointments to the main CSV log with a single write call.
+        
+        Args:
+            entries: List of dicts holding log_appointment arguments
+                     (acuity_record, action, and optionally injected,
+                     airtable_record_id, notes, formatted_datetime)
         """
         try:
-            with open(self.log_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    acuity_record.get('appointment_id', ''),
-                    acuity_record.get('client_name', ''),
-                    acuity_record.get('email', ''),
-                    acuity_record.get('phone', ''),
-                    self._format_datetime_to_est(acuity_record.get('datetime', '')),
-                    acuity_record.get('appointment_type', ''),
-                    'Cancelled' if action == 'CANCELLED' else 'Active',
-                    'Yes' if action == 'CANCELLED' else 'No',
-                    acuity_record.get('dateCreated', ''),
-                    action,
-                    'Yes' if injected else 'No',
-                    airtable_record_id,
-                    notes
-                ])
+            timestamp = self._now_str()
+            lines = [_fast_row(self._build_log_row(timestamp, **entry)) for entry in entries]
+            self._get_handle(self.log_file).write(''.join(lines))
         except Exception as e:
-            print(f"[WARNING] Could not log to CSV: {e}")
+            _log.warning("Could not log to CSV: %s", e)
     
-    def log_form_data(self, acuity_record: Dict):
+    def _build_log_row(
+        self,
+        timestamp: str,
+        acuity_record: Dict,
+        action: str,
+        injected: bool = False,
+        airtable_record_id: str = '',
+        notes: str = '',
+        formatted_datetime: Optional[str] = None
+    ) -> List:
+        """
+        Build a main CSV log row for an appointment.
+        
+        Args:
+            timestamp: Value for the Timestamp column
+            acuity_record: Acuity appointment record
+            action: Action taken (e.g., 'PROCESSED', 'CANCELLED')
+            injected: Whether record was injected to Airtable
+            airtable_record_id: Airtable record ID if injected
+            notes: Additional notes
+            formatted_datetime: Precomputed formatted appointment datetime (optional)
+            
+        Returns:
+            List of column values
+        """
+        if formatted_datetime is None:
+            formatted_datetime = self._format_datetime_to_est(acuity_record.get('datetime', ''))
+        
+        try:
+            fields = _get_log_record_fields(acuity_record)
+        except KeyError:
+            fields = [acuity_record.get(field, '') for field in _LOG_RECORD_FIELDS]
+        appointment_id, client_name, email, phone, appointment_type, date_created = fields
+        
+        return [
+            timestamp,
+            appointment_id,
+            client_name,
+            email,
+            phone,
+            formatted_datetime,
+            appointment_type,
+            'Cancelled' if action == 'CANCELLED' else 'Active',
+            'Yes' if action == 'CANCELLED' else 'No',
+            date_created,
+            action,
+            'Yes' if injected else 'No',
+            airtable_record_id,
+            notes
+        ]
+    
+    def log_form_data(self, acuity_record: Dict, formatted_datetime: Optional[str] = None):
         """
         Log intake form Q&A to form-specific CSV file.
         
+        The row may be buffered, or held in memory if it adds columns to the
+        file; it is guaranteed to be on disk only after close() or
+        compact_all().
+        
         Args:
             acuity_record: Acuity appointment record with forms
+            formatted_datetime: Appointment datetime already formatted by
+                                _format_datetime_to_est (computed if None)
         """
+        # Nothing to write: skip before any filename or datetime work
+        if not acuity_record.get('forms'):
+            return
+        
         try:
             appointment_type = acuity_record.get('appointment_type', 'unknown')
-            csv_filename = self._get_form_csv_filename(appointment_type)
-            csv_filepath = os.path.join(self.forms_dir, csv_filename)
+            if self.aggregate_forms:
+                csv_filepath = self._aggregated_csv_path()
+            else:
+                csv_filename = self._get_form_csv_filename(appointment_type)
+                csv_filepath = self._forms_dir_prefix + csv_filename
             
             # Extract and structure form data
-            form_data = self._extract_form_data(acuity_record)
+            form_data = self._extract_form_data(acuity_record, formatted_datetime)
             if not form_data:
                 return
             
+            if self.aggregate_forms:
+                form_data[_FORM_TYPE_COL] = appointment_type
+            
             # Handle CSV headers and write data
             self._write_form_csv(csv_filepath, form_data)
             
         except Exception as e:
-            print(f"[WARNING] Could not save form to CSV: {e}")
+            _log.warning("Could not save form to CSV: %s", e)
+    
+    def _aggregated_csv_path(self, day: Optional[datetime] = None) -> str:
+        """
+        Get the path of the daily aggregated forms CSV.
+        
+        Args:
+            day: Date of the file (defaults to today)
+            
+        Returns:
+            Path like "csv_exports/forms_20260309.csv"
+        """
+        return f"{self._forms_dir_prefix}forms_{(day or datetime.now()).strftime('%Y%m%d')}.csv"
     
-    def _extract_form_data(self, acuity_record: Dict) -> Optional[Dict]:
+    def split_aggregated(self, aggregated_path: Optional[str] = None, output_dir: Optional[str] = None) -> Dict[str, str]:
+        """
+        Split an aggregated forms CSV into one CSV per form type.
+        
+        Args:
+            aggregated_path: Aggregated CSV to split (defaults to today's file)
+            output_dir: Directory for the per-form files
+                        (defaults to a "by_form_type" folder in the forms directory)
+            
+        Returns:
+            Dictionary mapping appointment types to CSV file paths
+        """
+        import pandas as pd
+        
+        aggregated_path = aggregated_path or self._aggregated_csv_path()
+        output_dir = output_dir or os.path.join(self.forms_dir, 'by_form_type')
+        
+        # Make sure everything logged so far is on disk
+        if aggregated_path in self._file_state:
+            self._compact_file(aggregated_path)
+        self._release_handle(aggregated_path)
+        
+        if not os.path.exists(aggregated_path):
+            return {}
+        
+        df = pd.read_csv(aggregated_path, dtype=str, keep_default_na=False)
+        if _FORM_TYPE_COL not in df.columns:
+            _log.warning("%s has no %s column", aggregated_path, _FORM_TYPE_COL)
+            return {}
+        
+        os.makedirs(output_dir, exist_ok=True)
+        
+        result = {}
+        for appointment_type, group in df.groupby(_FORM_TYPE_COL, sort=False):
+            filepath = os.path.join(output_dir, self._get_form_csv_filename(appointment_type))
+            group = group.drop(columns=_FORM_TYPE_COL)
+            # Drop question columns that only other form types use
+            keep = [
+                col for col in group.columns
+                if col in config.FORM_CSV_BASE_HEADERS or (group[col] != '').any()
+            ]
+            group[keep].to_csv(filepath, index=False)
+            result[appointment_type] = filepath
+        
+        return result
+    
+    def _extract_form_data(
+        self,
+        acuity_record: Dict,
+        formatted_datetime: Optional[str] = None
+    ) -> Optional[Dict]:
         """
         Extract form data from Acuity record.
         
         Args:
             acuity_record: Acuity appointment record
+            formatted_datetime: Appointment datetime already formatted by
+                                _format_datetime_to_est (computed if None)
             
         Returns:
             Dictionary of form data or None if no forms
@@ -139,31 +594,35 @@ class CSVLogger:
         if not forms:
             return None
         
+        if formatted_datetime is None:
+            formatted_datetime = self._format_datetime_to_est(acuity_record.get('datetime', ''))
+        
         # Check if this is a reschedule by comparing with existing records
         is_rescheduled = self._check_if_rescheduled(
             acuity_record.get('appointment_id', ''),
-            self._format_datetime_to_est(acuity_record.get('datetime', '')),
+            formatted_datetime,
             acuity_record.get('canceled', False)
         )
         
         form_data = {
-            'Sync Timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Appointment ID': acuity_record.get('appointment_id', ''),
+            _SYNC_TS: self._now_str(),
+            _APT_ID: acuity_record.get('appointment_id', ''),
             'Client Name': acuity_record.get('client_name', ''),
             'Email': acuity_record.get('email', ''),
             'Phone': acuity_record.get('phone', ''),
-            'Appointment DateTime': self._format_datetime_to_est(acuity_record.get('datetime', '')),
-            'Canceled': 'Yes' if acuity_record.get('canceled', False) else 'No',
-            'Rescheduled': 'Yes' if is_rescheduled else 'No'
+            _APT_DATETIME: formatted_datetime,
+            _CANCELED: 'Yes' if acuity_record.get('canceled', False) else 'No',
+            _RESCHEDULED: 'Yes' if is_rescheduled else 'No'
         }
         
-        # Add all form field Q&A
-        for form in forms:
-            for field in form.get('values', []):
-                field_name = field.get('name', '').strip()
-                field_value = field.get('value', '')
-                if field_name:
-                    form_data[field_name] = field_value
+        # Add all form field Q&A in one pass (question names repeat across every
+        # record of a form, so they're interned)
+        form_data.update({
+            field_name: field.get('value', '')
+            for form in forms
+            for field in form.get('values') or ()
+            if (field_name := sys.intern(field.get('name', '').strip()))
+        })
         
         return form_data
     
@@ -182,74 +641,143 @@ class CSVLogger:
         if not appointment_id:
             return False
         
-        # Find the CSV file for this appointment type
-        # We need to check all form CSV files since we don't know which one contains this appointment
-        if not os.path.exists(self.forms_dir):
+        if self._apt_index is None:
+            self._load_apt_index()
+        
+        existing = self._apt_index.get(appointment_id)
+        if not existing:
             return False
         
+        # Any earlier record with a different datetime or canceled status is a reschedule/change
+        current = (current_datetime, 'Yes' if is_canceled else 'No')
+        return len(existing) > 1 or current not in existing
+    
+    def _load_apt_index(self):
+        """
+        Build the appointment index with one pass over every form CSV file.
+        """
+        self._apt_index = {}
+        self._flush_handles()
+        
+        # Rows still waiting for a header rewrite aren't on disk yet
+        for state in self._file_state.values():
+            for form_data in state['pending']:
+                self._index_written_row(form_data)
+        
         try:
-            # Check all CSV files in the forms directory
-            for filename in os.listdir(self.forms_dir):
-                if not filename.endswith('.csv'):
-                    continue
-                
-                csv_filepath = os.path.join(self.forms_dir, filename)
-                try:
-                    with open(csv_filepath, 'r', newline='', encoding='utf-8') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if row.get('Appointment ID', '') == appointment_id:
-                                # Found existing record - check if datetime or status changed
-                                existing_datetime = row.get('Appointment DateTime', '')
-                                existing_canceled = row.get('Canceled', 'No')
-                                current_canceled = 'Yes' if is_canceled else 'No'
-                                
-                                # If datetime changed or canceled status changed, it's a reschedule/change
-                                if existing_datetime != current_datetime or existing_canceled != current_canceled:
-                                    return True
-                except Exception:
-                    continue
+            with os.scandir(self.forms_dir) as entries:
+                csv_paths = [e.path for e in entries if e.name.endswith('.csv') and e.is_file()]
+        except OSError:
+            return
+        
+        # Files are independent, so read them in parallel once there are enough of them
+        if len(csv_paths) >= _INDEX_PARALLEL_MIN_FILES:
+            with ThreadPoolExecutor(max_workers=min(_INDEX_MAX_WORKERS, len(csv_paths))) as executor:
+                results = list(executor.map(self._scan_index_file, csv_paths))
+        else:
+            results = [self._scan_index_file(path) for path in csv_paths]
+        
+        for entries in results:
+            for apt_id, appointment_datetime, canceled in entries:
+                self._apt_index.setdefault(apt_id, set()).add((appointment_datetime, canceled))
+    
+    def _scan_index_file(self, csv_filepath: str) -> List[Tuple[str, str, str]]:
+        """
+        Read the appointment index entries from one form CSV file.
+        
+        Args:
+            csv_filepath: Path to CSV file
             
-            return False
+        Returns:
+            List of (Appointment ID, Appointment DateTime, Canceled) tuples
+        """
+        entries = []
+        try:
+            with open(csv_filepath, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                idx = {sys.intern(h): i for i, h in enumerate(next(reader, None) or [])}
+                apt_id_idx = idx.get(_APT_ID)
+                if apt_id_idx is None:
+                    return entries
+                dt_idx = idx.get(_APT_DATETIME)
+                canceled_idx = idx.get(_CANCELED)
+                
+                for row in reader:
+                    apt_id = _cell(row, apt_id_idx)
+                    if apt_id:
+                        entries.append((
+                            apt_id,
+                            _cell(row, dt_idx) if dt_idx is not None else '',
+                            _cell(row, canceled_idx) if canceled_idx is not None else 'No'
+                        ))
         except Exception:
-            return False
+            pass  # Keep whatever was read before the error
+        return entries
+    
+    def _index_written_row(self, form_data: Dict):
+        """
+        Record a row that was just written to a form CSV in the appointment index.
+        
+        Args:
+            form_data: Dictionary of form data that was written
+        """
+        if self._apt_index is None:
+            return  # Index not built yet; it will pick the row up from disk
+        
+        apt_id = form_data.get(_APT_ID)
+        if apt_id is None or apt_id == '':
+            return
+        
+        # Values are keyed the way they read back from the CSV file
+        self._apt_index.setdefault(str(apt_id), set()).add(
+            (str(form_data.get(_APT_DATETIME, '')), str(form_data.get(_CANCELED, '')))
+        )
     
     def _write_form_csv(self, filepath: str, form_data: Dict):
         """
         Write form data to CSV, handling dynamic headers.
         Always appends new records, never overwrites existing ones.
         
+        Duplicate detection and the Rescheduled flag are resolved against the
+        cached file state. Rows are only ever appended here; anything that needs
+        the whole file rewritten (new headers, earlier rows to flag as
+        rescheduled, duplicates already on disk) is deferred to one compaction
+        pass per file (see compact_all()).
+        
         Args:
             filepath: Path to CSV file
             form_data: Dictionary of form data
         """
-        file_exists = os.path.exists(filepath)
+        state = self._get_file_state(filepath)
+        existing_headers = state['headers']
+        
+        # Work out the final Rescheduled flag before checking for duplicates
+        apt_id = form_data.get(_APT_ID, '')
+        apt_key = '' if apt_id is None else str(apt_id)
+        sort_key = form_data.get(_EXPORT_TS, '') or form_data.get(_SYNC_TS, '')
+        appointment = state['appointments'].get(apt_key) if apt_key else None
+        
+        if appointment is not None:
+            appointment_datetime = form_data.get(_APT_DATETIME, '')
+            datetimes = appointment['datetimes'] | ({appointment_datetime} if appointment_datetime else set())
+            
+            if sort_key < appointment['first_key']:
+                # New row becomes the first record: only earlier rows with another
+                # datetime that aren't flagged yet need rewriting
+                if len(datetimes) > 1 and any(dt != appointment_datetime for dt in appointment['unflagged']):
+                    state['dirty'] = True
+            elif len(datetimes) > 1:
+                first_datetime = appointment['first_datetime']
+                if appointment_datetime != first_datetime:
+                    form_data[_RESCHEDULED] = 'Yes'
+                # Earlier rows with a different datetime that aren't flagged yet
+                if any(dt != first_datetime for dt in appointment['unflagged']):
+                    state['dirty'] = True
         
         # Check if this exact record already exists (all fields identical)
-        if file_exists:
-            try:
-                # Create signature for the new record
-                new_signature = self._create_record_signature(form_data)
-                
-                with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        existing_signature = self._create_record_signature(row)
-                        if existing_signature == new_signature:
-                            # Exact duplicate - skip it
-                            return
-            except Exception:
-                pass
-        
-        # Read existing headers if file exists
-        existing_headers = []
-        if file_exists:
-            try:
-                with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.reader(f)
-                    existing_headers = next(reader, [])
-            except Exception:
-                existing_headers = []
+        signature = self._create_record_signature(form_data)
+        if signature in state['signatures']:
+            return
         
         # Merge headers (existing + new fields)
         all_headers = list(existing_headers) if existing_headers else config.FORM_CSV_BASE_HEADERS.copy()
@@ -259,138 +787,413 @@ class CSVLogger:
             if key not in all_headers:
                 all_headers.append(key)
         
-        # If headers changed, rewrite file with new headers
-        if file_exists and existing_headers and set(all_headers) != set(existing_headers):
-            self._rewrite_csv_with_new_headers(filepath, all_headers, form_data)
+        if state['pending'] or (existing_headers and set(all_headers) != set(existing_headers)):
+            # Headers changed: hold the row until the file is rewritten with new headers
+            state['pending'].append(form_data)
         else:
             # Normal append (or create new file)
             try:
-                with open(filepath, 'a' if file_exists else 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=all_headers)
-                    if not file_exists:
-                        writer.writeheader()
-                    writer.writerow(form_data)
+                # Write positionally; all_headers covers every key in form_data
+                writer = self._get_writer(filepath)
+                if not existing_headers:
+                    writer.writerow(all_headers)
+                writer.writerow([form_data.get(header, '') for header in all_headers])
             except Exception as e:
-                print(f"[WARNING] Could not write to form CSV: {e}")
+                _log.warning("Could not write to form CSV: %s", e)
+                return
+        
+        self._index_written_row(form_data)
         
-        # Fix rescheduled field after writing
-        self._fix_rescheduled_field_in_file(filepath)
+        # Keep the cached state in step with what was just written
+        state['headers'] = all_headers
+        state['signatures'].add(signature)
+        self._track_appointment(
+            state,
+            apt_key,
+            form_data.get(_APT_DATETIME, ''),
+            sort_key,
+            form_data.get(_RESCHEDULED, 'No')
+        )
         
-        # Deduplicate records in the file
-        self._dedupe_csv_file(filepath)
+        # Bound the rows held in memory for files with a header change
+        if len(state['pending']) >= config.FORM_CSV_MAX_PENDING_ROWS:
+            self._compact_file(filepath)
     
-    def _fix_rescheduled_field_in_file(self, filepath: str):
+    def _get_file_state(self, filepath: str) -> Dict:
         """
-        Fix the Rescheduled field in a CSV file after writing new records.
-        Marks records as rescheduled if they have the same appointment_id but different datetime.
+        Get the cached state for a form CSV file, loading it on first use.
         
         Args:
             filepath: Path to CSV file
+            
+        Returns:
+            Dictionary with headers, signatures, appointments, pending and dirty
         """
-        if not os.path.exists(filepath):
-            return
+        state = self._file_state.get(filepath)
+        if state is not None and state['headers'] and not state['pending'] and not os.path.exists(filepath):
+            # Removed outside the logger: don't append rows under a missing header
+            self._release_handle(filepath)
+            state = None
+        if state is None:
+            state = self._load_file_state(filepath)
+            self._file_state[filepath] = state
+        return state
+    
+    def _load_file_state(self, filepath: str) -> Dict:
+        """
+        Read a form CSV file once and collect what writes need to know about it.
+        
+        The file is marked dirty if it contains duplicates or unflagged
+        reschedules, so it gets rewritten on compaction.
+        
+        Args:
+            filepath: Path to CSV file
+            
+        Returns:
+            File state dictionary
+        """
+        state = {
+            'headers': [],
+            'signatures': set(),
+            'appointments': {},
+            'pending': [],
+            'dirty': False
+        }
         
         try:
-            # Read all records
-            records = []
             with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                headers = reader.fieldnames
+                reader = csv.reader(f)
+                headers = [sys.intern(h) for h in next(reader, None) or []]
+                state['headers'] = headers
+                idx = {h: i for i, h in enumerate(headers)}
+                apt_id_idx = idx.get(_APT_ID)
+                dt_idx = idx.get(_APT_DATETIME)
+                export_idx = idx.get(_EXPORT_TS)
+                sync_idx = idx.get(_SYNC_TS)
+                rescheduled_idx = idx.get(_RESCHEDULED)
                 
-                if 'Rescheduled' not in headers:
-                    return  # No Rescheduled column, skip
-                
-                records = list(reader)
-            
-            if not records:
+                for row in reader:
+                    signature = self._create_row_signature(headers, row)
+                    if signature in state['signatures']:
+                        state['dirty'] = True
+                    state['signatures'].add(signature)
+                    
+                    if apt_id_idx is None:
+                        continue
+                    
+                    self._track_appointment(
+                        state,
+                        _cell(row, apt_id_idx),
+                        _cell(row, dt_idx),
+                        _cell(row, export_idx) or _cell(row, sync_idx),
+                        _cell(row, rescheduled_idx) if rescheduled_idx is not None else 'No'
+                    )
+        except FileNotFoundError:
+            return state
+        except Exception:
+            # Fall back to treating the file as headerless, as before
+            state['headers'] = []
+            state['dirty'] = True
+            return state
+        
+        for appointment in state['appointments'].values():
+            if len(appointment['datetimes']) > 1 and any(
+                dt != appointment['first_datetime'] for dt in appointment['unflagged']
+            ):
+                state['dirty'] = True
+                break
+        
+        return state
+    
+    def _track_appointment(
+        self,
+        state: Dict,
+        apt_id: str,
+        appointment_datetime: str,
+        sort_key: str,
+        rescheduled: str
+    ):
+        """
+        Record a row's appointment details in a file state.
+        
+        Args:
+            state: File state dictionary
+            apt_id: Appointment ID as stored in the CSV
+            appointment_datetime: Appointment DateTime value
+            sort_key: Export/Sync Timestamp used to find the first record
+            rescheduled: Rescheduled value of the row
+        """
+        if not apt_id:
+            return
+        
+        appointment = state['appointments'].get(apt_id)
+        if appointment is None:
+            appointment = {
+                'first_key': sort_key,
+                'first_datetime': appointment_datetime,
+                'datetimes': set(),
+                'unflagged': set()
+            }
+            state['appointments'][apt_id] = appointment
+        elif sort_key < appointment['first_key']:
+            appointment['first_key'] = sort_key
+            appointment['first_datetime'] = appointment_datetime
+        
+        if appointment_datetime:
+            appointment['datetimes'].add(appointment_datetime)
+        if rescheduled != 'Yes':
+            appointment['unflagged'].add(appointment_datetime)
+    
+    def compact_all(self):
+        """
+        Apply all deferred rewrites to the form CSV files.
+        
+        Call this at the end of a sync (close() and the context manager do it
+        automatically) so pending rows are written and Rescheduled flags and
+        duplicates are settled on disk.
+        """
+        csv_paths = [
+            filepath for filepath, state in list(self._file_state.items())
+            if state['pending'] or state['dirty']
+        ]
+        
+        # Each file is rewritten by exactly one task, so files are independent
+        if len(csv_paths) >= _COMPACT_PARALLEL_MIN_FILES and not sys.is_finalizing():
+            try:
+                with ThreadPoolExecutor(max_workers=min(_COMPACT_MAX_WORKERS, len(csv_paths))) as executor:
+                    list(executor.map(self._compact_file, csv_paths))
+                return
+            except RuntimeError:
+                # No new threads at interpreter exit (e.g. from the atexit hook):
+                # compact whatever is left serially instead
+                csv_paths = [filepath for filepath in csv_paths if filepath in self._file_state]
+        
+        for filepath in csv_paths:
+            self._compact_file(filepath)
+    
+    def _compact_file(self, filepath: str):
+        """
+        Rewrite a form CSV once with its final headers, pending rows, Rescheduled
+        flags fixed and duplicates removed, then drop its cached state so it is
+        reloaded from disk.
+        
+        Records sharing an appointment_id but with different datetimes are marked
+        as rescheduled (all but the earliest). Duplicates are detected by comparing
+        all fields except timestamps, keeping the first occurrence.
+        
+        Rows are streamed from the file into a temporary file in the same
+        directory, which replaces the original only if something changed, so the
+        file is never held in memory or left half-written.
+        
+        Args:
+            filepath: Path to CSV file
+        """
+        state = self._file_state.pop(filepath, None)
+        self._release_handle(filepath)
+        
+        pending = state['pending'] if state else []
+        source_exists = os.path.exists(filepath)
+        if not source_exists and not pending:
+            return
+        
+        # Only new columns to add: swap the header line and leave existing rows alone
+        if pending and source_exists and not state['dirty']:
+            if self._append_columns(filepath, state['headers'], pending):
                 return
+        
+        tmp_path = None
+        try:
+            if pending:
+                # New headers only ever extend the existing ones, so existing rows keep
+                # their column positions and just need padding
+                headers = state['headers']
+            elif source_exists:
+                # Cached headers are empty if the file didn't parse, so read them from disk
+                with open(filepath, 'r', newline='', encoding='utf-8') as f:
+                    headers = next(csv.reader(f), None) or []
+            else:
+                headers = []
+            width = len(headers)
+            pending_rows = [[row.get(header, '') for header in headers] for row in pending]
             
-            # Group records by appointment_id
-            records_by_appointment = defaultdict(list)
-            for i, record in enumerate(records):
-                apt_id = record.get('Appointment ID', '')
-                if apt_id:
-                    records_by_appointment[apt_id].append((i, record))
+            def iter_rows():
+                if source_exists:
+                    with open(filepath, 'r', newline='', encoding='utf-8') as f:
+                        reader = csv.reader(f)
+                        next(reader, None)
+                        for row in reader:
+                            if pending and len(row) < width:
+                                row.extend([''] * (width - len(row)))
+                            yield row
+                yield from pending_rows
             
-            # Track if any updates were made
-            updates_made = False
+            # Pass 1: find each appointment's first datetime
+            columns = self._reschedule_columns(headers)
+            first_by_appointment = self._collect_first_datetimes(columns, iter_rows()) if columns else {}
             
-            # For each appointment_id with multiple records
-            for apt_id, record_list in records_by_appointment.items():
-                if len(record_list) <= 1:
-                    continue  # Only one record, can't be rescheduled
-                
-                # Get all unique datetimes for this appointment
-                datetimes = set()
-                for _, record in record_list:
-                    datetime_val = record.get('Appointment DateTime', '')
-                    if datetime_val:
-                        datetimes.add(datetime_val)
-                
-                # If there are multiple datetimes, mark all but the first as rescheduled
-                if len(datetimes) > 1:
-                    # Sort by Export Timestamp or Sync Timestamp to find the first one
-                    sorted_records = sorted(
-                        record_list, 
-                        key=lambda x: x[1].get('Export Timestamp', '') or x[1].get('Sync Timestamp', '')
-                    )
-                    
-                    # First record stays as "No" (or keep existing value if already "Yes")
-                    first_idx, first_record = sorted_records[0]
-                    first_datetime = first_record.get('Appointment DateTime', '')
-                    
-                    # Mark all others with different datetime as rescheduled
-                    for idx, record in sorted_records[1:]:
-                        record_datetime = record.get('Appointment DateTime', '')
-                        if record_datetime != first_datetime:
-                            if records[idx].get('Rescheduled', 'No') != 'Yes':
-                                records[idx]['Rescheduled'] = 'Yes'
-                                updates_made = True
-            
-            # Write updated records back if changes were made
-            if updates_made:
-                with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=headers)
-                    writer.writeheader()
-                    writer.writerows(records)
+            # Pass 2: fix flags, drop duplicates (keeping the first occurrence) and
+            # stream the result to a temporary file
+            changed = bool(pending)
+            seen_signatures = set()
+            tmp_path = filepath + '.tmp'
+            with open(tmp_path, 'w', newline='', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                for row in iter_rows():
+                    if columns and self._flag_rescheduled(columns, first_by_appointment, row):
+                        changed = True
+                    signature = self._create_row_signature(headers, row)
+                    if signature in seen_signatures:
+                        changed = True
+                        continue
+                    seen_signatures.add(signature)
+                    writer.writerow(row)
+            
+            # Replace the file only if something changed
+            if changed:
+                os.replace(tmp_path, filepath)
+            else:
+                os.remove(tmp_path)
+            tmp_path = None
         except Exception as e:
-            # Silently fail - don't break the export if fixing fails
-            pass
+            _log.warning("Could not compact form CSV %s: %s", filepath, e)
+            if pending:
+                _log.warning("%d row(s) for %s were not written", len(pending), filepath)
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
     
-    def _rewrite_csv_with_new_headers(self, filepath: str, new_headers: list, new_row: Dict):
+    def _append_columns(self, filepath: str, headers: List[str], pending: List[Dict]) -> bool:
         """
-        Rewrite CSV file with updated headers, preserving all existing records.
+        Add new columns to a form CSV without re-parsing its rows.
+        
+        The header line is replaced and the rest of the file is copied byte for
+        byte, then pending rows are appended. Existing rows stay shorter than the
+        new header, which CSV readers treat as empty trailing columns.
         
         Args:
             filepath: Path to CSV file
-            new_headers: Updated list of headers
-            new_row: New row to append
+            headers: New header list (existing headers followed by new ones)
+            pending: Rows waiting for the new headers
+            
+        Returns:
+            True if the file was rewritten; False if it doesn't look like a file
+            this logger wrote (the caller then falls back to a full rewrite)
         """
-        # Read all existing data
-        existing_data = []
+        tmp_path = filepath + '.tmp'
         try:
-            with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                existing_data = list(reader)
+            with open(filepath, 'rb') as src:
+                # Find the header line by re-serializing the current header row
+                first_line = src.readline()
+                try:
+                    old_headers = next(csv.reader([first_line.decode('utf-8')]))
+                except (StopIteration, UnicodeDecodeError, csv.Error):
+                    return False
+                if _serialize_rows([old_headers]) != first_line or headers[:len(old_headers)] != old_headers:
+                    return False
+                
+                # Appending rows needs the body to end with a line break
+                if src.seek(0, os.SEEK_END) > len(first_line):
+                    src.seek(-1, os.SEEK_END)
+                    if src.read(1) != b'\n':
+                        return False
+                src.seek(len(first_line))
+                
+                with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as dst:
+                    dst.write(_serialize_rows([headers]))
+                    shutil.copyfileobj(src, dst, _WRITE_BUFFER_SIZE)
+                    dst.write(_serialize_rows([row.get(header, '') for header in headers] for row in pending))
+            
+            os.replace(tmp_path, filepath)
+            return True
         except Exception as e:
-            print(f"[WARNING] Could not read existing CSV: {e}")
+            _log.warning("Could not add columns to form CSV %s: %s", filepath, e)
+            return False
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def _reschedule_columns(self, headers: List[str]) -> Optional[Tuple]:
+        """
+        Get the column indexes used to fix Rescheduled flags.
         
-        # Rewrite file with new headers, preserving all existing records
-        try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=new_headers)
-                writer.writeheader()
-                # Write all existing records (missing fields will be empty)
-                for row in existing_data:
-                    # Ensure all new headers are present in row
-                    for header in new_headers:
-                        if header not in row:
-                            row[header] = ''
-                    writer.writerow(row)
-                # Add the new row
-                writer.writerow(new_row)
-        except Exception as e:
-            print(f"[WARNING] Could not rewrite CSV with new headers: {e}")
+        Args:
+            headers: CSV header row
+            
+        Returns:
+            (apt_id, datetime, export_ts, sync_ts, rescheduled) indexes, or None
+            if the file has no Appointment ID or Rescheduled column
+        """
+        idx = {h: i for i, h in enumerate(headers)}
+        apt_id_idx = idx.get(_APT_ID)
+        rescheduled_idx = idx.get(_RESCHEDULED)
+        
+        if apt_id_idx is None or rescheduled_idx is None:
+            return None  # No Rescheduled column, skip
+        
+        return (apt_id_idx, idx.get(_APT_DATETIME), idx.get(_EXPORT_TS), idx.get(_SYNC_TS), rescheduled_idx)
+    
+    def _collect_first_datetimes(self, columns: Tuple, rows) -> Dict[str, List]:
+        """
+        Find, per appointment_id, the earliest record's datetime (by Export or Sync
+        Timestamp, first in file order on ties) and all distinct datetimes.
+        
+        Args:
+            columns: Indexes from _reschedule_columns
+            rows: Iterable of csv.reader rows
+            
+        Returns:
+            Dictionary of appointment_id -> [first sort key, first datetime, datetimes]
+        """
+        apt_id_idx, dt_idx, export_idx, sync_idx, _ = columns
+        first_by_appointment = {}
+        for record in rows:
+            apt_id = _cell(record, apt_id_idx)
+            if not apt_id:
+                continue
+            sort_key = _cell(record, export_idx) or _cell(record, sync_idx)
+            record_datetime = _cell(record, dt_idx)
+            first = first_by_appointment.get(apt_id)
+            if first is None:
+                first = [sort_key, record_datetime, set()]
+                first_by_appointment[apt_id] = first
+            elif sort_key < first[0]:
+                first[0] = sort_key
+                first[1] = record_datetime
+            if record_datetime:
+                first[2].add(record_datetime)
+        return first_by_appointment
+    
+    def _flag_rescheduled(self, columns: Tuple, first_by_appointment: Dict[str, List], record: List[str]) -> bool:
+        """
+        Mark a row as rescheduled in place if its appointment has multiple datetimes
+        and its datetime differs from the first one (existing "Yes" values are kept).
+        
+        Args:
+            columns: Indexes from _reschedule_columns
+            first_by_appointment: Result of _collect_first_datetimes
+            record: csv.reader row (modified in place)
+            
+        Returns:
+            True if the row was updated
+        """
+        apt_id_idx, dt_idx, _, _, rescheduled_idx = columns
+        apt_id = _cell(record, apt_id_idx)
+        if not apt_id:
+            return False
+        
+        _, first_datetime, datetimes = first_by_appointment[apt_id]
+        if (
+            len(datetimes) <= 1
+            or _cell(record, dt_idx) == first_datetime
+            or _cell(record, rescheduled_idx) == 'Yes'
+        ):
+            return False
+        
+        if len(record) <= rescheduled_idx:
+            record.extend([''] * (rescheduled_idx + 1 - len(record)))
+        record[rescheduled_idx] = 'Yes'
+        return True
     
     def _get_form_csv_filename(self, appointment_type: str) -> str:
         """
@@ -402,6 +1205,22 @@ class CSVLogger:
         Returns:
             Clean filename (e.g., "product_development_help_desk.csv")
         """
+        filename = self._filename_cache.get(appointment_type)
+        if filename is None:
+            filename = self._compute_form_csv_filename(appointment_type)
+            self._filename_cache[appointment_type] = filename
+        return filename
+    
+    def _compute_form_csv_filename(self, appointment_type: str) -> str:
+        """
+        Build the CSV filename for an appointment type (uncached).
+        
+        Args:
+            appointment_type: Full appointment type string
+            
+        Returns:
+            Clean filename
+        """
         # Split by pipe (|) to get parts
         parts = [p.strip() for p in appointment_type.split('|')]
         
@@ -429,14 +1248,14 @@ class CSVLogger:
             part_lower = part.lower()
             
             # Skip parts that are just price indicators or prefixes
-            if re.match(r'^(free|paid|\$\d+)', part_lower):
+            if _PRICE_PREFIX_RE.match(part_lower):
                 continue
             
             # Check for parts with names in parentheses (likely advisor/instructor names)
             if '(' in part and ')' in part:
                 before_paren = part.split('(')[0].strip()
                 # If the text before parentheses contains form keywords, use it
-                if self.form_type_keywords and any(keyword in before_paren.lower() for keyword in self.form_type_keywords):
+                if self._has_form_keyword(before_paren.lower()):
                     form_name = before_paren
                     break
                 # If it looks like a person's name (short, capitalized, no keywords), skip it
@@ -444,7 +1263,7 @@ class CSVLogger:
                     continue
             
             # Check if this part contains a session keyword (if keywords are configured)
-            if self.form_type_keywords and any(keyword in part_lower for keyword in self.form_type_keywords):
+            if self._has_form_keyword(part_lower):
                 form_name = part
                 break
         
@@ -454,6 +1273,18 @@ class CSVLogger:
         
         return form_name
     
+    def _has_form_keyword(self, text: str) -> bool:
+        """
+        Check if lowercased text contains any configured form type keyword.
+        
+        Args:
+            text: Lowercased text to check
+            
+        Returns:
+            True if a keyword is found (always False when no keywords are configured)
+        """
+        return self._keyword_re is not None and self._keyword_re.search(text) is not None
+    
     def _looks_like_person_name(self, text: str) -> bool:
         """
         Check if text looks like a person's name.
@@ -474,7 +1305,7 @@ class CSVLogger:
             return False
         
         # Doesn't contain form keywords
-        if self.form_type_keywords and any(keyword in text.lower() for keyword in self.form_type_keywords):
+        if self._has_form_keyword(text.lower()):
             return False
         
         # Common patterns for advisor appointments
@@ -507,7 +1338,7 @@ class CSVLogger:
             len(parts) <= 2 and
             len(appointment_type.split()) <= 4 and
             appointment_type[0].isupper() and
-            (not self.form_type_keywords or not any(keyword in appointment_type.lower() for keyword in self.form_type_keywords))
+            not self._has_form_keyword(appointment_type.lower())
         )
         
         if is_likely_name:
@@ -516,7 +1347,7 @@ class CSVLogger:
         # Filter out short parts and likely names
         meaningful_parts = [
             p for p in parts
-            if len(p) > 10 and not re.match(r'^(free|paid|\$\d+)', p.lower())
+            if len(p) > 10 and not _PRICE_PREFIX_RE.match(p)
         ]
         
         if meaningful_parts:
@@ -535,18 +1366,21 @@ class CSVLogger:
             Cleaned filename-safe name
         """
         # Remove any prefix like "Current Students Only:"
-        form_name = re.sub(r'^[^:]+:\s*', '', form_name)
+        form_name = _COLON_PREFIX_RE.sub('', form_name)
         
         # Remove price prefixes
-        form_name = re.sub(r'^(FREE|PAID|\$\d+)\s*\|\s*', '', form_name, flags=re.IGNORECASE)
+        form_name = _PRICE_BAR_RE.sub('', form_name)
         
         # Remove any remaining parenthetical content
-        form_name = re.sub(r'\s*\([^)]*\)', '', form_name)
+        form_name = _PAREN_RE.sub('', form_name)
         
         # Convert to lowercase and replace spaces/special chars with underscores
         cleaned = form_name.lower()
-        cleaned = re.sub(r'[^a-z0-9]+', '_', cleaned)
-        cleaned = cleaned.strip('_')
+        if cleaned.isascii():
+            # Splitting on '_' and dropping empty parts collapses runs and strips the ends
+            cleaned = '_'.join(filter(None, cleaned.translate(_FILENAME_TRANS).split('_')))
+        else:
+            cleaned = _NONALNUM_RE.sub('_', cleaned).strip('_')
         
         # Limit length and ensure it's not empty
         if not cleaned or len(cleaned) < 3:
@@ -556,70 +1390,31 @@ class CSVLogger:
         
         return cleaned
     
-    def _dedupe_csv_file(self, filepath: str):
+    def _create_record_signature(self, row: Dict) -> FrozenSet[Tuple[str, str]]:
         """
-        Remove duplicate records from a CSV file.
-        Compares all fields (excluding timestamps) to identify duplicates.
-        Keeps the first occurrence of each unique record.
+        Create a unique signature from all field values (excluding timestamp fields).
+        Used for deduplication by comparing all columns.
         
         Args:
-            filepath: Path to CSV file
-        """
-        if not os.path.exists(filepath):
-            return
-        
-        try:
-            # Read all records
-            records = []
-            seen_signatures = set()
-            duplicates_removed = 0
+            row: Dictionary of record data
             
-            with open(filepath, 'r', newline='', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                headers = reader.fieldnames
-                
-                for row in reader:
-                    signature = self._create_record_signature(row)
-                    
-                    if signature in seen_signatures:
-                        duplicates_removed += 1
-                    else:
-                        seen_signatures.add(signature)
-                        records.append(row)
-            
-            # Only rewrite if duplicates were found
-            if duplicates_removed > 0:
-                with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.DictWriter(f, fieldnames=headers)
-                    writer.writeheader()
-                    writer.writerows(records)
-        except Exception as e:
-            # Silently fail - don't break the export if deduplication fails
-            pass
+        Returns:
+            Hashable signature representing all field values
+        """
+        return _signature_from_items(row.items())
     
-    def _create_record_signature(self, row: Dict) -> str:
+    def _create_row_signature(self, headers: List[str], row: List[str]) -> FrozenSet[Tuple[str, str]]:
         """
-        Create a unique signature from all field values (excluding timestamp fields).
-        Used for deduplication by comparing all columns.
+        Create the same signature as _create_record_signature for a csv.reader row.
         
         Args:
-            row: Dictionary of record data
+            headers: CSV header row
+            row: List of values in header order
             
         Returns:
-            String signature representing all field values
+            Hashable signature representing all field values
         """
-        # Create a sorted tuple of all key-value pairs (excluding timestamp fields)
-        fields = []
-        timestamp_fields = {'Export Timestamp', 'Sync Timestamp', 'Timestamp'}
-        
-        for key, value in sorted(row.items()):
-            if key not in timestamp_fields:
-                # Normalize values: convert to string and strip whitespace
-                normalized_value = str(value).strip() if value is not None else ''
-                fields.append(f"{key}:{normalized_value}")
-        
-        # Create signature from all fields
-        return "|".join(fields)
+        return _signature_from_items(zip(headers, row))
     
     def _format_datetime_to_est(self, datetime_str: str) -> str:
         """
@@ -635,40 +1430,10 @@ class CSVLogger:
             return ''
         
         try:
-            # Map timezone abbreviations to timezone objects for parsing
-            est_tz = pytz.timezone('US/Eastern')
-            tzinfos = {
-                'EST': est_tz,
-                'EDT': est_tz,
-                'CST': pytz.timezone('US/Central'),
-                'CDT': pytz.timezone('US/Central'),
-                'MST': pytz.timezone('US/Mountain'),
-                'MDT': pytz.timezone('US/Mountain'),
-                'PST': pytz.timezone('US/Pacific'),
-                'PDT': pytz.timezone('US/Pacific'),
-            }
-            
-            # Parse the datetime string with timezone info
-            dt = date_parser.parse(datetime_str, tzinfos=tzinfos)
-            
-            # Convert to EST/EDT (handles daylight saving automatically)
-            
-            # If datetime is timezone-aware, convert to EST
-            if dt.tzinfo is not None:
-                dt_est = dt.astimezone(est_tz)
-            else:
-                # If timezone-naive, assume UTC and convert to EST
-                dt_utc = pytz.utc.localize(dt)
-                dt_est = dt_utc.astimezone(est_tz)
-            
-            # Format: "March 9, 2026 4:00 PM EST" or "March 9, 2026 4:00 PM EDT"
-            timezone_abbr = dt_est.strftime('%Z')  # EST or EDT
-            formatted = dt_est.strftime('%B %d, %Y %I:%M %p') + f' {timezone_abbr}'
-            
-            return formatted
+            return _format_datetime_est(datetime_str)
             
         except Exception as e:
             # If parsing fails, return original string
-            print(f"[WARNING] Could not parse datetime '{datetime_str}': {e}")
+            _log.warning("Could not parse datetime '%s': %s", datetime_str, e)
             return datetime_str
 
@@ -7,14 +7,206 @@ Provides a web interface to:
 """
 import streamlit as st
 import pandas as pd
+import logging
 import os
+import threading
 import traceback
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from acuity_airtable_sdk import AcuityAirtableSDK
+import csv
 import io
+import math
 import sys
 
+# The SDK's modules log through `logging`; show their INFO messages on the
+# console alongside the print-based output, as berkley.py does. basicConfig
+# does nothing once a handler exists, so reruns don't add handlers
+logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s", stream=sys.stdout)
+
+# Rows shown per page in the CSV viewer
+_PAGE_SIZE = 1000
+
+# How long another session's sync is reused instead of running a new one
+_SHARED_SYNC_MAX_AGE = timedelta(minutes=5)
+
+# Business-specific configuration: form type keywords for extracting form names.
+# A tuple so it can be used as a cache key for get_sdk
+FORM_TYPE_KEYWORDS = (
+    'help desk', 'helpdesk', 'q&a', 'q & a', 'session',
+    'essentials', 'advising', 'workshop', 'clinic', 'appointment'
+)
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def get_sdk(form_type_keywords: tuple, fallback_form_name: str) -> AcuityAirtableSDK:
+    """
+    Build the SDK bound to the Student Profile table, shared across reruns and sessions.
+    
+    Clients, HTTP sessions and the table's columns are reused instead of being
+    set up on every click; the hour-long TTL picks up Airtable schema changes.
+    
+    Args:
+        form_type_keywords: Keywords identifying form types (a tuple, so it can be hashed)
+        fallback_form_name: Name for forms that can't be categorized
+        
+    Returns:
+        Configured AcuityAirtableSDK
+    """
+    sdk = AcuityAirtableSDK(
+        form_type_keywords=list(form_type_keywords),
+        fallback_form_name=fallback_form_name
+    )
+    sdk.airtable.use_table("Student Profile")
+    return sdk
+
+
+@st.cache_resource
+def get_shared_sync() -> dict:
+    """
+    Get the latest sync, shared by every session of this server process.
+    
+    Returns:
+        Dict with a 'lock' that serializes syncs and the 'latest' sync (or None)
+    """
+    return {'lock': threading.Lock(), 'latest': None}
+
+
+def run_sync(hours: int, force: bool = False) -> dict:
+    """
+    Sync to Airtable and export to CSV, or reuse a recent sync from any session.
+    
+    Syncs are serialized, so a session that asks while another one is syncing
+    waits for it and then reuses its results instead of calling the APIs again.
+    
+    Args:
+        hours: Number of hours to look back
+        force: Run a new sync even if a recent one can be reused
+        
+    Returns:
+        Dict with results, csv_files, time and hours of the sync
+    """
+    shared = get_shared_sync()
+    with shared['lock']:
+        latest = shared['latest']
+        if (not force and latest is not None and latest['hours'] == hours
+                and datetime.now() - latest['time'] < _SHARED_SYNC_MAX_AGE):
+            return latest
+        
+        sdk = get_sdk(FORM_TYPE_KEYWORDS, "advisor_1_on_1_session")
+        
+        # Syncing to Airtable and exporting to CSV are independent and
+        # I/O-bound, so run them side by side
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # Step 1: Sync to Airtable
+                sync_future = executor.submit(
+                    sdk.sync,
+                    hours=hours,
+                    include_canceled=True,
+                    verbose=False,  # Disable verbose to reduce output
+                    timestamp_field="Last Update"
+                )
+                
+                # Step 2: Export to CSV
+                export_future = executor.submit(
+                    sdk.export_to_csv,
+                    hours=hours,
+                    include_canceled=True,
+                    group_by_appointment_type=True,
+                    output_dir="forms_csv"
+                )
+                
+                results = sync_future.result()
+                csv_files = export_future.result()
+        finally:
+            # The SDK outlives this run, so settle its CSV logger now rather
+            # than at interpreter exit
+            sdk.close()
+        
+        shared['latest'] = {
+            'results': results,
+            'csv_files': csv_files,
+            'time': datetime.now(),
+            'hours': hours
+        }
+        return shared['latest']
+
+
+def remember_sync(sync: dict):
+    """
+    Store a sync in this session's state for the results tab.
+    
+    Args:
+        sync: Sync as returned by run_sync
+    """
+    st.session_state['last_sync_results'] = sync['results']
+    st.session_state['last_sync_csv_files'] = sync['csv_files']
+    st.session_state['last_sync_time'] = sync['time']
+    st.session_state['last_sync_hours'] = sync['hours']
+
+
+@st.cache_data(show_spinner=False)
+def list_csv_files(dir_path: str, dir_mtime: float) -> list:
+    """
+    List the CSV files in a directory (cached until files are added or removed).
+    
+    Args:
+        dir_path: Directory to scan
+        dir_mtime: Directory modification time, part of the cache key
+        
+    Returns:
+        Paths of the CSV files, as strings
+    """
+    with os.scandir(dir_path) as entries:
+        return sorted(e.path for e in entries if e.name.endswith(".csv") and e.is_file())
+
+
+@st.cache_data(show_spinner=False)
+def count_csv_rows(path: str, mtime: float) -> int:
+    """
+    Count the data rows in a CSV file (cached until the file changes).
+    
+    Rows are counted with csv.reader rather than by lines, since answers can
+    contain line breaks.
+    
+    Args:
+        path: Path to CSV file
+        mtime: File modification time, part of the cache key
+        
+    Returns:
+        Number of rows, excluding the header
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_csv_page(path: str, mtime: float, page: int, page_size: int) -> pd.DataFrame:
+    """
+    Read one page of rows from a CSV file (cached until the file changes).
+    
+    Every column is read as text: the exports hold form answers, so type
+    inference is wasted work and would mangle values like phone numbers.
+    
+    Args:
+        path: Path to CSV file
+        mtime: File modification time, part of the cache key
+        page: 1-based page number
+        page_size: Rows per page
+        
+    Returns:
+        DataFrame with the rows of the requested page
+    """
+    return pd.read_csv(
+        path,
+        skiprows=range(1, 1 + (page - 1) * page_size),
+        nrows=page_size,
+        dtype=str,
+        keep_default_na=False
+    )
+
 
 # Page configuration
 st.set_page_config(
@@ -39,84 +231,86 @@ with st.sidebar:
         help="Number of hours to look back for appointments"
     )
     
-    if st.button("🚀 Run Sync", type="primary", use_container_width=True):
+    run_clicked = st.button("🚀 Run Sync", type="primary", use_container_width=True)
+    force_clicked = st.button(
+        "🔁 Refresh (force)",
+        use_container_width=True,
+        help="Run a new sync even if another session just ran one"
+    )
+    
+    if run_clicked or force_clicked:
+        st.session_state.pop('last_sync_error', None)
         with st.spinner("Running sync... This may take a moment."):
             try:
-                # Run the sync
-                # Business-specific configuration: form type keywords for extracting form names
-                form_type_keywords = [
-                    'help desk', 'helpdesk', 'q&a', 'q & a', 'session',
-                    'essentials', 'advising', 'workshop', 'clinic', 'appointment'
-                ]
-                
-                sdk = AcuityAirtableSDK(
-                    form_type_keywords=form_type_keywords,
-                    fallback_form_name="advisor_1_on_1_session"
-                )
-                sdk.airtable.use_table("Student Profile")
-                
-                # Step 1: Sync to Airtable
-                results = sdk.sync(
-                    hours=hours,
-                    include_canceled=True,
-                    verbose=False,  # Disable verbose to reduce output
-                    timestamp_field="Last Update"
-                )
-                
-                # Step 2: Export to CSV
-                csv_files = sdk.export_to_csv(
-                    hours=hours,
-                    include_canceled=True,
-                    group_by_appointment_type=True,
-                    output_dir="forms_csv"
-                )
-                
-                # Store results in session state
-                st.session_state['last_sync_results'] = results
-                st.session_state['last_sync_csv_files'] = csv_files
-                st.session_state['last_sync_time'] = datetime.now()
-                st.session_state['last_sync_hours'] = hours
+                # Run the sync and store results in session state
+                remember_sync(run_sync(hours, force=force_clicked))
                 
+                # The tabs render after the sidebar in this same run, so they
+                # pick up the new results without a rerun
                 st.success("✅ Sync completed successfully!")
-                st.rerun()
                 
             except Exception as e:
-                st.error(f"❌ Sync failed: {str(e)}")
-                with st.expander("View Error Details"):
-                    st.code(traceback.format_exc())
+                st.session_state['last_sync_error'] = e
+    
+    # Keep the exception rather than its formatted traceback, and only format
+    # it when the details are asked for
+    sync_error = st.session_state.get('last_sync_error')
+    if sync_error is not None:
+        st.error(f"❌ Sync failed: {str(sync_error)}")
+        if st.toggle("View Error Details"):
+            st.code("".join(traceback.format_exception(type(sync_error), sync_error, sync_error.__traceback__)))
 
-# Main content area
-tab1, tab2 = st.tabs(["📊 Sync Results", "📁 CSV Forms"])
 
-with tab1:
+# Run the tabs as fragments where available (Streamlit 1.33+), so widgets in
+# one tab only rerun that tab instead of the whole script
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+
+@fragment
+def results_tab(default_hours: int):
+    """
+    Render the results of the last sync.
+    
+    Args:
+        default_hours: Lookback shown if the last sync didn't record one
+    """
     st.header("Last Sync Results")
     
+    # Show a newer sync run from another session
+    latest = get_shared_sync()['latest']
+    if latest is not None and latest['time'] > st.session_state.get('last_sync_time', datetime.min):
+        remember_sync(latest)
+    
     if 'last_sync_results' in st.session_state:
         results = st.session_state['last_sync_results']
         csv_files = st.session_state['last_sync_csv_files']
         sync_time = st.session_state.get('last_sync_time', datetime.now())
         
         # Display summary
-        sync_hours = st.session_state.get('last_sync_hours', hours)
+        sync_hours = st.session_state.get('last_sync_hours', default_hours)
         st.info(f"📅 Last sync: {sync_time.strftime('%Y-%m-%d %H:%M:%S')} | Lookback: {sync_hours} hours")
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Forms Fetched", results['forms_fetched'])
-        with col2:
-            st.metric("Successfully Synced", results['successful'], delta=None)
-        with col3:
-            st.metric("Failed", results['failed'], delta=None, delta_color="inverse")
-        with col4:
-            st.metric("CSV Files Created", len(csv_files))
+        metrics = [
+            ("Forms Fetched", results['forms_fetched']),
+            ("Successfully Synced", results['successful']),
+            ("Failed", results['failed']),
+            ("CSV Files Created", len(csv_files)),
+        ]
+        for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+            col.metric(label, value)
         
         # Display errors if any
         if results['failed'] > 0:
             st.warning(f"⚠️ {results['failed']} record(s) failed to sync")
             with st.expander("View Errors"):
-                for error in results['errors']:
-                    st.error(f"**{error['form'].get('client_name', 'Unknown')}**: {error['error']}")
+                # One table instead of one element per error
+                errors_df = pd.DataFrame(
+                    [
+                        {"Client": error['form'].get('client_name', 'Unknown'), "Error": error['error']}
+                        for error in results['errors']
+                    ]
+                )
+                st.dataframe(errors_df, use_container_width=True, hide_index=True)
         
         # Display CSV files created
         if csv_files:
@@ -126,7 +320,10 @@ with tab1:
     else:
         st.info("👈 Run a sync from the sidebar to see results here")
 
-with tab2:
+
+@fragment
+def viewer_tab():
+    """Render the CSV forms viewer."""
     st.header("CSV Forms Viewer")
     
     # Get all CSV files
@@ -134,25 +331,33 @@ with tab2:
     if not csv_dir.exists():
         st.warning("No CSV files directory found. Run a sync first.")
     else:
-        csv_files = list(csv_dir.glob("*.csv"))
+        csv_files = list_csv_files(str(csv_dir), csv_dir.stat().st_mtime)
         
         if not csv_files:
             st.info("No CSV files found. Run a sync first.")
         else:
             # File selector
-            selected_file = st.selectbox(
+            selected_path = st.selectbox(
                 "Select CSV File",
                 options=csv_files,
-                format_func=lambda x: x.name
+                format_func=os.path.basename
             )
             
-            if selected_file:
+            if selected_path:
+                selected_file = Path(selected_path)
                 try:
-                    # Read and display CSV
-                    df = pd.read_csv(selected_file)
+                    mtime = selected_file.stat().st_mtime
+                    row_count = count_csv_rows(str(selected_file), mtime)
                     
                     # Display file info
-                    st.info(f"📄 **{selected_file.name}** - {len(df)} records")
+                    st.info(f"📄 **{selected_file.name}** - {row_count} records")
+                    
+                    # Read only the rows for the current page
+                    page_count = max(1, math.ceil(row_count / _PAGE_SIZE))
+                    page = 1
+                    if page_count > 1:
+                        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+                    df = load_csv_page(str(selected_file), mtime, page, _PAGE_SIZE)
                     
                     # Display dataframe
                     st.dataframe(
@@ -161,8 +366,8 @@ with tab2:
                         height=400
                     )
                     
-                    # Download button
-                    csv_data = df.to_csv(index=False)
+                    # Download button (the whole file, not just this page)
+                    csv_data = selected_file.read_bytes()
                     st.download_button(
                         label="📥 Download CSV",
                         data=csv_data,
@@ -173,3 +378,12 @@ with tab2:
                 except Exception as e:
                     st.error(f"Error reading CSV file: {str(e)}")
 
+
+# Main content area
+tab1, tab2 = st.tabs(["📊 Sync Results", "📁 CSV Forms"])
+
+with tab1:
+    results_tab(hours)
+
+with tab2:
+    viewer_tab()
@@ -0,0 +1,124 @@
+"""
+Tests for CSVLogger's deferred form CSV writes.
+"""
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _record(appointment_id, appointment_type, values):
+    """Build a minimal Acuity record with one intake form."""
+    return {
+        'appointment_id': appointment_id,
+        'client_name': f'Client {appointment_id}',
+        'email': 'client@example.com',
+        'phone': '555',
+        'datetime': '2026-03-09T16:00:00-0400',
+        'appointment_type': appointment_type,
+        'canceled': False,
+        'forms': [{'id': 1, 'values': [{'name': k, 'value': v} for k, v in values]}]
+    }
+
+
+def _read_rows(filepath):
+    """Read a CSV file as a list of dicts."""
+    with open(filepath, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+class ExitWithoutCloseTest(unittest.TestCase):
+    """Rows held in memory must reach disk when the process exits without close()."""
+
+    def _run_and_exit(self, records):
+        """Log records in a fresh interpreter that exits without calling close()."""
+        workdir = tempfile.mkdtemp()
+        script = textwrap.dedent(f"""
+            import sys
+            sys.path.insert(0, {REPO_DIR!r})
+            from csv_logger import CSVLogger
+
+            logger = CSVLogger(form_type_keywords=['session'])
+            for record in {records!r}:
+                logger.log_form_data(record)
+        """)
+        subprocess.run([sys.executable, '-c', script], cwd=workdir, check=True)
+        return os.path.join(workdir, 'csv_exports')
+
+    def test_pending_rows_in_several_files_are_written_at_exit(self):
+        # The second row of each file adds a column, so it is held until compaction
+        forms_dir = self._run_and_exit([
+            _record(1, 'Alpha Session', [('Q1', 'a')]),
+            _record(2, 'Beta Session', [('Q1', 'b')]),
+            _record(3, 'Alpha Session', [('Q1', 'c'), ('Q2', 'new')]),
+            _record(4, 'Beta Session', [('Q1', 'd'), ('Q2', 'new')]),
+        ])
+
+        alpha = _read_rows(os.path.join(forms_dir, 'alpha_session.csv'))
+        beta = _read_rows(os.path.join(forms_dir, 'beta_session.csv'))
+        self.assertEqual([row['Appointment ID'] for row in alpha], ['1', '3'])
+        self.assertEqual([row['Appointment ID'] for row in beta], ['2', '4'])
+        self.assertEqual(alpha[1]['Q2'], 'new')
+        self.assertEqual(beta[1]['Q2'], 'new')
+
+    def test_buffered_and_pending_rows_in_one_file_are_written_at_exit(self):
+        # Plain appends sit in the handle's write buffer; the last row is held
+        forms_dir = self._run_and_exit([
+            _record(1, 'Alpha Session', [('Q1', 'a')]),
+            _record(2, 'Alpha Session', [('Q1', 'b')]),
+            _record(3, 'Alpha Session', [('Q1', 'c'), ('Q2', 'new')]),
+        ])
+
+        alpha = _read_rows(os.path.join(forms_dir, 'alpha_session.csv'))
+        self.assertEqual([row['Appointment ID'] for row in alpha], ['1', '2', '3'])
+        # Earlier rows may be left short when only the header line gains columns
+        self.assertEqual([row['Q2'] or '' for row in alpha], ['', '', 'new'])
+
+
+
+class RemovedFileTest(unittest.TestCase):
+    """A form CSV removed outside the logger is recreated with its header."""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        sys.path.insert(0, REPO_DIR)
+        from csv_logger import CSVLogger
+        self.logger = CSVLogger(form_type_keywords=['session'])
+        self.filepath = os.path.join('csv_exports', 'alpha_session.csv')
+
+    def tearDown(self):
+        self.logger.close()
+        os.chdir(self._cwd)
+
+    def _assert_single_row(self, appointment_id):
+        rows = _read_rows(self.filepath)
+        self.assertEqual([row['Appointment ID'] for row in rows], [appointment_id])
+        self.assertEqual(rows[0]['Q1'], 'b')
+
+    def test_removed_after_close(self):
+        self.logger.log_form_data(_record(1, 'Alpha Session', [('Q1', 'a')]))
+        self.logger.close()
+        os.remove(self.filepath)
+
+        self.logger.log_form_data(_record(2, 'Alpha Session', [('Q1', 'b')]))
+        self.logger.close()
+        self._assert_single_row('2')
+
+    def test_removed_between_writes(self):
+        self.logger.log_form_data(_record(1, 'Alpha Session', [('Q1', 'a')]))
+        self.logger._flush_handles()
+        os.remove(self.filepath)
+
+        self.logger.log_form_data(_record(2, 'Alpha Session', [('Q1', 'b')]))
+        self.logger.close()
+        self._assert_single_row('2')
+
+
+if __name__ == '__main__':
+    unittest.main()